@@ -0,0 +1,38 @@
+"""
+Simulation clock helpers.
+
+Events and entities created during the same tick share one ISO timestamp
+instead of each formatting datetime.now() on their own. The frozen timestamp
+is a context variable, so worlds ticking on different threads or asyncio tasks
+each see their own.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Iterator, Optional
+
+_tick_timestamp: ContextVar[Optional[str]] = ContextVar('tick_timestamp', default=None)
+
+
+def now_iso() -> str:
+    """Return the current tick's timestamp, or the wall-clock time outside a tick."""
+    return _tick_timestamp.get() or datetime.now().isoformat()
+
+
+@contextmanager
+def tick_timestamp() -> Iterator[str]:
+    """
+    Freeze the timestamp returned by now_iso() for the duration of a tick.
+    Nested use keeps the outermost tick's timestamp.
+    """
+    current = _tick_timestamp.get()
+    if current is not None:
+        yield current
+        return
+    current = datetime.now().isoformat()
+    token = _tick_timestamp.set(current)
+    try:
+        yield current
+    finally:
+        _tick_timestamp.reset(token)
@@ -1,21 +1,46 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Any, Optional
-from uuid import uuid4
-from datetime import datetime
+import os
+from src.core.clock import now_iso
+from src.utils.compat import DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Entity:
     """Base class for all entities in the simulation."""
-    id: str = field(default_factory=lambda: str(uuid4()))
+    id: Optional[str] = None  # Generated in __post_init__ when not supplied
     name: str = ""
     description: str = ""
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: Optional[str] = None  # Stamped in __post_init__ when not supplied
     attributes: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        """Resolve generated defaults only when the caller did not provide them."""
+        if self.id is None:
+            self.id = os.urandom(16).hex()
+        if self.created_at is None:
+            self.created_at = now_iso()
+
+    @staticmethod
+    def bulk_ids(count: int) -> List[str]:
+        """
+        Generate several random entity ids from a single urandom read.
+
+        Args:
+            count: Number of ids to generate
+
+        Returns:
+            List of 32-character hex ids
+        """
+        block = os.urandom(16 * count).hex()
+        return [block[i:i + 32] for i in range(0, 32 * count, 32)]
+
     def to_dict(self) -> dict:
-        """Convert entity to dictionary."""
+        """
+        Convert entity to dictionary.
+        Container fields are shared by reference, not copied.
+        """
         return {
             'id': self.id,
             'name': self.name,
@@ -28,13 +53,14 @@ class Entity:
     @classmethod
     def from_dict(cls, data: dict) -> 'Entity':
         """Create entity from dictionary."""
+        get = data.get
         return cls(
-            id=data.get('id', str(uuid4())),
-            name=data.get('name', ''),
-            description=data.get('description', ''),
-            created_at=data.get('created_at', datetime.now().isoformat()),
-            attributes=data.get('attributes', {}),
-            metadata=data.get('metadata', {})
+            id=get('id'),
+            name=get('name', ''),
+            description=get('description', ''),
+            created_at=get('created_at'),
+            attributes=get('attributes', {}),
+            metadata=get('metadata', {})
         )
 
     def update_attribute(self, key: str, value: Any):
@@ -46,56 +72,77 @@ class Entity:
         return self.attributes.get(key, default)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Character(Entity):
     """Represents a character in the simulation."""
     health: int = 100
     energy: int = 100
     level: int = 1
     experience: int = 0
-    inventory: List[str] = field(default_factory=list)
+    inventory: Dict[str, None] = field(default_factory=dict)  # insertion-ordered set of item ids
     location: Optional[str] = None
     status: str = "active"  # active, inactive, removed
     relationships: Dict[str, int] = field(default_factory=dict)  # character_id -> affinity
+    # Lookup cache kept by AttackAction and re-checked on use; not part of the persisted schema,
+    # so to_dict/from_dict skip it and injections cannot set it (init=False)
+    equipped_weapon_id: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict:
         """Convert character to dictionary."""
-        data = super().to_dict()
-        data.update({
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'created_at': self.created_at,
+            'attributes': self.attributes,
+            'metadata': self.metadata,
             'health': self.health,
             'energy': self.energy,
             'level': self.level,
             'experience': self.experience,
-            'inventory': self.inventory,
+            'inventory': list(self.inventory),
             'location': self.location,
             'status': self.status,
             'relationships': self.relationships
-        })
-        return data
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Character':
         """Create character from dictionary."""
-        char = super().from_dict(data)
-        char.health = data.get('health', 100)
-        char.energy = data.get('energy', 100)
-        char.level = data.get('level', 1)
-        char.experience = data.get('experience', 0)
-        char.inventory = data.get('inventory', [])
-        char.location = data.get('location')
-        char.status = data.get('status', 'active')
-        char.relationships = data.get('relationships', {})
-        return char
+        get = data.get
+        return cls(
+            id=get('id'),
+            name=get('name', ''),
+            description=get('description', ''),
+            created_at=get('created_at'),
+            attributes=get('attributes', {}),
+            metadata=get('metadata', {}),
+            health=get('health', 100),
+            energy=get('energy', 100),
+            level=get('level', 1),
+            experience=get('experience', 0),
+            inventory=get('inventory', []),
+            location=get('location'),
+            status=get('status', 'active'),
+            relationships=get('relationships', {})
+        )
+
+    def __post_init__(self):
+        Entity.__post_init__(self)
+        if not isinstance(self.inventory, dict):
+            self.inventory = dict.fromkeys(self.inventory)
 
     def take_damage(self, amount: int) -> int:
         """
         Apply damage to the character.
         Returns actual damage taken.
         """
-        actual_damage = max(0, min(amount, self.health))
-        self.health -= actual_damage
-        if self.health <= 0:
-            self.status = "inactive"
+        health = self.health
+        actual_damage = amount if amount < health else health
+        actual_damage = actual_damage if actual_damage > 0 else 0
+        health -= actual_damage
+        self.health = health
+        self.status = "inactive" if health <= 0 else self.status
         return actual_damage
 
     def heal(self, amount: int) -> int:
@@ -103,8 +150,8 @@ class Character(Entity):
         Heal the character.
         Returns actual amount healed.
         """
-        max_health = self.get_attribute('max_health', 100)
-        actual_heal = min(amount, max_health - self.health)
+        missing = self.attributes.get('max_health', 100) - self.health
+        actual_heal = amount if amount < missing else missing
         self.health += actual_heal
         return actual_heal
 
@@ -113,24 +160,25 @@ class Character(Entity):
         Add experience and potentially level up.
         Returns True if leveled up.
         """
-        self.experience += amount
+        experience = self.experience + amount
         exp_needed = self.level * 100
+        leveled_up = experience >= exp_needed
 
-        if self.experience >= exp_needed:
-            self.experience -= exp_needed
+        if leveled_up:
+            experience -= exp_needed
             self.level += 1
-            self.health = self.get_attribute('max_health', 100)  # Full heal on level up
-            return True
-        return False
+            self.health = self.attributes.get('max_health', 100)  # Full heal on level up
+        self.experience = experience
+        return leveled_up
 
     def add_item(self, item_id: str):
         """Add an item to inventory."""
-        self.inventory.append(item_id)
+        self.inventory[item_id] = None
 
     def remove_item(self, item_id: str) -> bool:
         """Remove an item from inventory."""
         if item_id in self.inventory:
-            self.inventory.remove(item_id)
+            del self.inventory[item_id]
             return True
         return False
 
@@ -143,7 +191,7 @@ class Character(Entity):
         return self.relationships.get(character_id, 0)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Item(Entity):
     """Represents an item in the simulation."""
     item_type: str = "generic"  # weapon, armor, consumable, key, etc.
@@ -157,8 +205,13 @@ class Item(Entity):
 
     def to_dict(self) -> dict:
         """Convert item to dictionary."""
-        data = super().to_dict()
-        data.update({
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'created_at': self.created_at,
+            'attributes': self.attributes,
+            'metadata': self.metadata,
             'item_type': self.item_type,
             'rarity': self.rarity,
             'value': self.value,
@@ -167,22 +220,28 @@ class Item(Entity):
             'max_stack': self.max_stack,
             'owner_id': self.owner_id,
             'location': self.location
-        })
-        return data
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Item':
         """Create item from dictionary."""
-        item = super().from_dict(data)
-        item.item_type = data.get('item_type', 'generic')
-        item.rarity = data.get('rarity', 'common')
-        item.value = data.get('value', 0)
-        item.stackable = data.get('stackable', False)
-        item.stack_size = data.get('stack_size', 1)
-        item.max_stack = data.get('max_stack', 99)
-        item.owner_id = data.get('owner_id')
-        item.location = data.get('location')
-        return item
+        get = data.get
+        return cls(
+            id=get('id'),
+            name=get('name', ''),
+            description=get('description', ''),
+            created_at=get('created_at'),
+            attributes=get('attributes', {}),
+            metadata=get('metadata', {}),
+            item_type=get('item_type', 'generic'),
+            rarity=get('rarity', 'common'),
+            value=get('value', 0),
+            stackable=get('stackable', False),
+            stack_size=get('stack_size', 1),
+            max_stack=get('max_stack', 99),
+            owner_id=get('owner_id'),
+            location=get('location')
+        )
 
     def use(self, target: Optional[Entity] = None) -> bool:
         """
@@ -195,57 +254,82 @@ class Item(Entity):
         return False
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Location(Entity):
     """Represents a location in the world."""
     location_type: str = "generic"
     parent_location: Optional[str] = None
     connected_locations: List[str] = field(default_factory=list)
-    characters: List[str] = field(default_factory=list)
-    items: List[str] = field(default_factory=list)
+    characters: Dict[str, None] = field(default_factory=dict)  # insertion-ordered set of character ids
+    items: Dict[str, None] = field(default_factory=dict)  # insertion-ordered set of item ids
     properties: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict:
         """Convert location to dictionary."""
-        data = super().to_dict()
-        data.update({
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'created_at': self.created_at,
+            'attributes': self.attributes,
+            'metadata': self.metadata,
             'location_type': self.location_type,
             'parent_location': self.parent_location,
             'connected_locations': self.connected_locations,
-            'characters': self.characters,
-            'items': self.items,
+            'characters': list(self.characters),
+            'items': list(self.items),
             'properties': self.properties
-        })
-        return data
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Location':
         """Create location from dictionary."""
-        loc = super().from_dict(data)
-        loc.location_type = data.get('location_type', 'generic')
-        loc.parent_location = data.get('parent_location')
-        loc.connected_locations = data.get('connected_locations', [])
-        loc.characters = data.get('characters', [])
-        loc.items = data.get('items', [])
-        loc.properties = data.get('properties', {})
-        return loc
+        get = data.get
+        return cls(
+            id=get('id'),
+            name=get('name', ''),
+            description=get('description', ''),
+            created_at=get('created_at'),
+            attributes=get('attributes', {}),
+            metadata=get('metadata', {}),
+            location_type=get('location_type', 'generic'),
+            parent_location=get('parent_location'),
+            connected_locations=get('connected_locations', []),
+            characters=get('characters', []),
+            items=get('items', []),
+            properties=get('properties', {})
+        )
+
+    def __post_init__(self):
+        Entity.__post_init__(self)
+        if not isinstance(self.characters, dict):
+            self.characters = dict.fromkeys(self.characters)
+        if not isinstance(self.items, dict):
+            self.items = dict.fromkeys(self.items)
 
     def add_character(self, character_id: str):
         """Add a character to this location."""
-        if character_id not in self.characters:
-            self.characters.append(character_id)
+        self.characters[character_id] = None
 
     def remove_character(self, character_id: str):
         """Remove a character from this location."""
-        if character_id in self.characters:
-            self.characters.remove(character_id)
+        self.characters.pop(character_id, None)
 
     def add_item(self, item_id: str):
         """Add an item to this location."""
-        if item_id not in self.items:
-            self.items.append(item_id)
+        self.items[item_id] = None
 
     def remove_item(self, item_id: str):
         """Remove an item from this location."""
-        if item_id in self.items:
-            self.items.remove(item_id)
+        self.items.pop(item_id, None)
+
+
+# Writable dataclass fields per entity class, so injections can route updates with one set lookup
+for _cls in (Entity, Character, Item, Location):
+    _cls._SETTABLE_FIELDS = frozenset(f.name for f in fields(_cls) if f.init)
+del _cls
+
+# Fields holding insertion-ordered id sets; code assigning them from outside converts list input
+Entity._ID_SET_FIELDS = frozenset()
+Character._ID_SET_FIELDS = frozenset(('inventory',))
+Location._ID_SET_FIELDS = frozenset(('characters', 'items'))
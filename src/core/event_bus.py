@@ -1,17 +1,25 @@
-from typing import Callable, Dict, List, Any, Optional
+from typing import Callable, Deque, Dict, List, Any, Optional, Tuple
+from collections import deque
+import sys
 from dataclasses import dataclass, field
-from datetime import datetime
+import logging
+from src.core.clock import now_iso
+from src.utils.compat import DATACLASS_SLOTS
 from src.utils.logger import logger
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Event:
     """Represents an event in the simulation."""
     event_type: str
     data: Dict[str, Any]
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: str = field(default_factory=now_iso)
     source: str = "system"
 
+    def __post_init__(self):
+        # Interned types let subscriber lookups hit the identity fast path
+        self.event_type = sys.intern(self.event_type)
+
     def to_dict(self) -> dict:
         """Convert event to dictionary."""
         return {
@@ -29,22 +37,25 @@ class EventBus:
     """
 
     def __init__(self):
-        self._subscribers: Dict[str, List[Callable[[Event], None]]] = {}
-        self._event_history: List[Event] = []
+        # Subscriber tuples are rebuilt on (un)subscribe so publish iterates immutable snapshots
+        self._subscribers: Dict[str, Tuple[Callable[[Event], None], ...]] = {}
+        self._wildcard: Tuple[Callable[[Event], None], ...] = ()
         self._max_history: int = 1000
+        self._event_history: Deque[Event] = deque(maxlen=self._max_history)
 
     def subscribe(self, event_type: str, callback: Callable[[Event], None]):
         """
         Subscribe to a specific event type.
 
         Args:
-            event_type: Type of event to subscribe to
+            event_type: Type of event to subscribe to (prefer an EventTypes constant)
             callback: Function to call when event is published
         """
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
-        self._subscribers[event_type].append(callback)
-        logger.debug(f"Subscribed to event type: {event_type}")
+        event_type = sys.intern(event_type)
+        self._subscribers[event_type] = self._subscribers.get(event_type, ()) + (callback,)
+        if event_type == '*':
+            self._wildcard = self._subscribers[event_type]
+        logger.debug("Subscribed to event type: %s", event_type)
 
     def unsubscribe(self, event_type: str, callback: Callable[[Event], None]):
         """
@@ -55,8 +66,12 @@ class EventBus:
             callback: The callback to remove
         """
         if event_type in self._subscribers:
-            self._subscribers[event_type].remove(callback)
-            logger.debug(f"Unsubscribed from event type: {event_type}")
+            subscribers = list(self._subscribers[event_type])
+            subscribers.remove(callback)
+            self._subscribers[event_type] = tuple(subscribers)
+            if event_type == '*':
+                self._wildcard = self._subscribers[event_type]
+            logger.debug("Unsubscribed from event type: %s", event_type)
 
     def publish(self, event: Event):
         """
@@ -65,28 +80,27 @@ class EventBus:
         Args:
             event: The event to publish
         """
-        # Store in history
+        # Store in history (deque evicts the oldest entry once full)
         self._event_history.append(event)
-        if len(self._event_history) > self._max_history:
-            self._event_history = self._event_history[-self._max_history:]
 
         # Notify subscribers
-        subscribers = self._subscribers.get(event.event_type, [])
-        for callback in subscribers:
-            try:
-                callback(event)
-            except Exception as e:
-                logger.error(f"Error in event callback for {event.event_type}: {e}")
+        subscribers = self._subscribers.get(event.event_type)
+        if subscribers:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error("Error in event callback for %s: %s", event.event_type, e)
 
         # Also notify wildcard subscribers
-        wildcard_subscribers = self._subscribers.get('*', [])
-        for callback in wildcard_subscribers:
+        for callback in self._wildcard:
             try:
                 callback(event)
             except Exception as e:
-                logger.error(f"Error in wildcard event callback: {e}")
+                logger.error("Error in wildcard event callback: %s", e)
 
-        logger.debug(f"Event published: {event.event_type}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Event published: %s", event.event_type)
 
     def emit(self, event_type: str, data: Dict[str, Any], source: str = "system"):
         """
@@ -114,7 +128,7 @@ class EventBus:
         if event_type:
             events = [e for e in self._event_history if e.event_type == event_type]
         else:
-            events = self._event_history.copy()
+            events = list(self._event_history)
 
         return events[-limit:]
 
@@ -152,3 +166,10 @@ class EventTypes:
 
     # Custom injection events
     CUSTOM_INJECTION = "custom_injection"
+
+
+# Intern the standard event type names once at import time
+for _name, _value in list(vars(EventTypes).items()):
+    if not _name.startswith('_') and isinstance(_value, str):
+        setattr(EventTypes, _name, sys.intern(_value))
+del _name, _value
@@ -1,16 +1,52 @@
+import asyncio
+import queue
+import threading
 import time
 import os
-import json
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List, Set, Tuple
+from src.core.clock import tick_timestamp
 from src.core.state_manager import StateManager
 from src.core.event_bus import EventBus, Event, EventTypes
 from src.core.entities import Character, Item, Location
-from src.modules.story_mod.narrator import Narrator
-from src.modules.story_mod.illustrator import Illustrator
 from src.utils.llm_client import LLMClient, create_llm_client
 from src.utils.logger import logger
 from universe.base_world import BaseWorld, WorldConfig, WorldRegistry
 
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    import json
+    from json import loads as json_loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # watchdog is optional; the inbox is polled every tick without it
+    Observer = None
+    FileSystemEventHandler = object
+
+
+class InboxEventHandler(FileSystemEventHandler):
+    """Forwards new or rewritten inbox JSON files to the simulation's inbox queue."""
+
+    _WATCHED_EVENTS = ('created', 'modified', 'moved', 'closed')
+
+    def __init__(self, inbox_queue: queue.SimpleQueue, on_event: Optional[Callable[[], None]] = None):
+        self._queue = inbox_queue
+        self._on_event = on_event
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in self._WATCHED_EVENTS:
+            return
+        path = getattr(event, 'dest_path', '') or event.src_path
+        if path.endswith(".json"):
+            self._queue.put(path)
+            if self._on_event is not None:
+                self._on_event()
+
 
 class Simulation:
     """
@@ -18,6 +54,62 @@ class Simulation:
     Integrates World, Story, and Game modules with hot injection and time machine support.
     """
 
+    LOG_INTERVAL = 10  # Ticks between progress log lines
+    ARCHIVE_BATCH_SIZE = 64  # Archived injections written per flush
+    MIN_SLEEP_NS = 1_000_000  # Shorter waits are slept without watching for wakeups
+
+    # Field defaults merged under injection payloads; keep mutable containers out,
+    # the entity from_dict() methods create fresh ones
+    _INJECTION_DEFAULTS = {
+        'add_character': {
+            'name': 'Unknown',
+            'description': 'An injected character',
+            'health': 100,
+            'energy': 100,
+            'level': 1,
+        },
+        'add_item': {
+            'name': 'Unknown Item',
+            'item_type': 'generic',
+            'rarity': 'common',
+            'value': 0,
+        },
+        'add_location': {
+            'name': 'Unknown Location',
+            'location_type': 'generic',
+        },
+    }
+
+    # Payload key -> entity field accepted per add injection; other payload keys are
+    # ignored, so injections cannot set e.g. inventories or occupancy directly
+    _INJECTION_FIELDS = {
+        'add_character': {
+            'name': 'name',
+            'description': 'description',
+            'health': 'health',
+            'energy': 'energy',
+            'level': 'level',
+            'attributes': 'attributes',
+            'location': 'location',
+        },
+        'add_item': {
+            'name': 'name',
+            'description': 'description',
+            'type': 'item_type',
+            'rarity': 'rarity',
+            'value': 'value',
+            'attributes': 'attributes',
+            'location': 'location',
+        },
+        'add_location': {
+            'name': 'name',
+            'description': 'description',
+            'type': 'location_type',
+            'connections': 'connected_locations',
+            'properties': 'properties',
+        },
+    }
+
     def __init__(
         self,
         world: Optional[BaseWorld] = None,
@@ -47,23 +139,60 @@ class Simulation:
 
         # Story systems
         self.llm_client = llm_client or create_llm_client()
-        self.narrator = Narrator(llm_client=self.llm_client) if enable_story_generation else None
-        self.illustrator = Illustrator(api_client=self.llm_client) if enable_story_generation else None
+        self.narrator = None
+        self.illustrator = None
+        if enable_story_generation:
+            # Imported here so headless simulations skip loading the story stack (jinja2 templates)
+            from src.modules.story_mod.narrator import Narrator
+            from src.modules.story_mod.illustrator import Illustrator
+            self.narrator = Narrator(llm_client=self.llm_client)
+            self.illustrator = Illustrator(api_client=self.llm_client)
 
         # Simulation state
         self.is_running = False
         self.last_save_tick = 0
         self.story_generation_interval = 10  # Generate story every N ticks
+        self.story_batch_size = 4  # Story windows narrated per LLM request
+        self._pending_story_windows: List[Tuple[int, int]] = []
+
+        # Absolute ticks at which the periodic story window and progress log fire next
+        self._next_story_tick = 0
+        self._next_log_tick = 0
+        self._reset_schedule()
+
+        # World state shared by the story and save steps of the current tick (None outside tick())
+        self._state_cache: Optional[Dict[str, Any]] = None
+
+        # Story batches run in worker threads while the async loop is active
+        self.max_llm_concurrency = 2
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        self._pending_tasks: Set[asyncio.Task] = set()
+
+        # Set while the async loop runs; stop() and new inbox files wake it between ticks
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # Set by stop() while the loop runs, so the loop runs _shutdown() as it exits; the
+        # lock makes stop() and the loop's exit agree on which of them runs it
+        self._stop_requested = False
+        self._stop_lock = threading.Lock()
 
         # Injection handling
         self.inbox_path = "data/inbox"
+        self._inbox_queue: Optional[queue.SimpleQueue] = None  # Set while a watchdog observer is running
+        self._inbox_observer = None
+        self._inbox_polling = Observer is None  # Scan the directory each tick instead of watching it
         self._injection_handlers: Dict[str, callable] = {}
         self._setup_default_injection_handlers()
 
+        # Processed injections are appended to the archive by a background writer, started on first use
+        self.archive_path = os.path.join("data/logs", "injections.log")
+        self._archive_queue: Optional[queue.SimpleQueue] = None
+        self._archive_thread: Optional[threading.Thread] = None
+
         # Register world
         WorldRegistry.register(self.world)
 
-        logger.info(f"Simulation initialized with world: {self.world.world_id}")
+        logger.info("Simulation initialized with world: %s", self.world.world_id)
 
     def _create_default_world(self) -> BaseWorld:
         """Create a default world instance."""
@@ -95,12 +224,30 @@ class Simulation:
         self.run_loop()
 
     def stop(self):
-        """Stop the simulation engine."""
+        """
+        Stop the simulation engine.
+
+        While the run loop is active (possibly on another thread), this only
+        signals it; the loop saves and writes the final story itself once its
+        current tick and in-flight story requests are done.
+        """
         logger.info("Stopping Simulation Engine...")
-        self.is_running = False
+        with self._stop_lock:
+            self.is_running = False
+            loop_active = self._stop_requested = self._loop is not None
+        if loop_active:
+            self._wake_loop()
+            return
+        self._shutdown()
+
+    def _shutdown(self):
+        """Stop the background writers, save a final snapshot and write the final story segment."""
+        self._stop_inbox_watcher()
+        self._stop_archive_writer()
 
         # Final save
         self._save_snapshot()
+        self.state_manager.flush()
 
         # Export final story
         if self.narrator:
@@ -108,63 +255,202 @@ class Simulation:
 
     def run_loop(self):
         """Main simulation loop."""
-        logger.info(f"Simulation running at {self.tick_rate}s per tick")
+        asyncio.run(self.run_loop_async())
 
-        while self.is_running:
-            start_time = time.time()
+    async def run_loop_async(self):
+        """
+        Tick scheduler; runs ticks on a fixed monotonic cadence and watches the inbox while running.
+        Story generation is offloaded so ticks never wait on LLM requests.
+        """
+        logger.info("Simulation running at %ss per tick", self.tick_rate)
+        self._llm_semaphore = asyncio.Semaphore(self.max_llm_concurrency)
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
 
+        # Monotonic integer clock: immune to wall-clock adjustments
+        deadline_ns = time.monotonic_ns()
+        try:
+            while self.is_running:
+                try:
+                    self.tick()
+                except Exception as e:
+                    logger.error("Error in tick: %s", e)
+
+                # Keep a fixed cadence; a late tick shortens the next wait, but at most one tick is made up
+                period_ns = int(self.tick_rate * 1e9)
+                now_ns = time.monotonic_ns()
+                deadline_ns = max(deadline_ns + period_ns, now_ns - period_ns)
+                await self._wait_until(deadline_ns)
+        finally:
+            # Let in-flight story requests finish before the final segment is written
+            if self._pending_tasks:
+                await asyncio.gather(*self._pending_tasks, return_exceptions=True)
+            self._llm_semaphore = None
+            self._wakeup = None
+            with self._stop_lock:
+                self._loop = None
+                stopped, self._stop_requested = self._stop_requested, False
+            # Stopped via stop(): finish up here, on the loop's thread, after the last tick
+            if stopped:
+                self._shutdown()
+
+    async def _wait_until(self, deadline_ns: int):
+        """Wait for a tick deadline, applying inbox files and honouring stop() as soon as they arrive."""
+        while self.is_running:
+            remaining_ns = deadline_ns - time.monotonic_ns()
+            if remaining_ns < self.MIN_SLEEP_NS:
+                break
+            self._wakeup.clear()
             try:
-                self.tick()
-            except Exception as e:
-                logger.error(f"Error in tick: {e}")
+                await asyncio.wait_for(self._wakeup.wait(), remaining_ns / 1e9)
+            except asyncio.TimeoutError:
+                return
+            if self.is_running:
+                self.check_inbox()
+
+        # Sub-millisecond remainder: one plain sleep; timer overshoot is fine for tick pacing
+        remaining_ns = deadline_ns - time.monotonic_ns()
+        if self.is_running and remaining_ns > 0:
+            await asyncio.sleep(remaining_ns / 1e9)
+
+    def _wake_loop(self):
+        """Interrupt the run loop's wait between ticks; safe to call from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    def _start_inbox_watcher(self):
+        """Start a watchdog observer feeding inbox files into a queue; fall back to polling on failure."""
+        os.makedirs(self.inbox_path, exist_ok=True)
+        inbox_queue = queue.SimpleQueue()
+
+        # Files already waiting in the inbox produce no filesystem event
+        with os.scandir(self.inbox_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    inbox_queue.put(entry.path)
+
+        try:
+            observer = Observer()
+            observer.schedule(InboxEventHandler(inbox_queue, self._wake_loop), self.inbox_path)
+            observer.start()
+        except Exception as e:
+            logger.warning("Inbox watcher unavailable, polling instead: %s", e)
+            self._inbox_polling = True
+            return
 
-            # Maintain tick rate
-            elapsed = time.time() - start_time
-            sleep_time = max(0, self.tick_rate - elapsed)
-            time.sleep(sleep_time)
+        self._inbox_observer = observer
+        self._inbox_queue = inbox_queue
+
+    def _stop_inbox_watcher(self):
+        """Stop the inbox observer; it is restarted on the next inbox check."""
+        if self._inbox_observer is not None:
+            self._inbox_observer.stop()
+            self._inbox_observer.join()
+            self._inbox_observer = None
+        self._inbox_queue = None
 
     def tick(self):
         """Execute a single simulation tick."""
-        self.world.tick()
-
-        # Process injections
-        self.check_inbox()
+        with tick_timestamp():
+            self.world.tick()
 
-        # Generate story periodically
-        if self.narrator and self.world.tick_count % self.story_generation_interval == 0:
-            self._generate_story_segment()
+            # Process injections
+            self.check_inbox()
 
-        # Auto-save
-        if self.auto_save_interval > 0:
-            if self.world.tick_count - self.last_save_tick >= self.auto_save_interval:
-                self._save_snapshot()
+            # Story and auto-save below share one get_state() result for the rest of the tick
+            self._state_cache = {}
+            try:
+                # Generate story periodically
+                if self.narrator and self.world.tick_count >= self._next_story_tick:
+                    self._queue_story_window()
+                    self._next_story_tick = self._next_multiple(self.world.tick_count, self.story_generation_interval)
+
+                # Auto-save
+                if self.auto_save_interval > 0:
+                    if self.world.tick_count - self.last_save_tick >= self.auto_save_interval:
+                        self._save_snapshot()
+            finally:
+                self._state_cache = None
 
         # Log progress
-        if self.world.tick_count % 10 == 0:
-            logger.info(f"Tick {self.world.tick_count} - Events: {len(self.world.event_log)}")
+        if self.world.tick_count >= self._next_log_tick:
+            logger.info("Tick %s - Events: %s", self.world.tick_count, len(self.world.event_log))
+            self._next_log_tick = self._next_multiple(self.world.tick_count, self.LOG_INTERVAL)
+
+    def _get_state(self) -> Dict[str, Any]:
+        """
+        Return the world state, built at most once per tick while tick() runs.
+        Outside tick() it is always rebuilt, since callers may have changed the world.
+        """
+        cache = self._state_cache
+        if cache is None:
+            return self.world.get_state()
+        if not cache:
+            cache.update(self.world.get_state())
+        return cache
+
+    @staticmethod
+    def _next_multiple(tick: int, interval: int) -> int:
+        """Return the first multiple of interval after tick."""
+        return (tick // interval + 1) * interval
+
+    def _reset_schedule(self):
+        """Recompute the periodic deadlines from the world's current tick."""
+        tick = self.world.tick_count
+        self._next_story_tick = self._next_multiple(tick, self.story_generation_interval)
+        self._next_log_tick = self._next_multiple(tick, self.LOG_INTERVAL)
 
     def check_inbox(self):
         """Check for and process injection files."""
-        if not os.path.exists(self.inbox_path):
+        if self._inbox_queue is None and not self._inbox_polling:
+            self._start_inbox_watcher()
+
+        if self._inbox_queue is not None:
+            # Watcher running: only touch files it reported, deduplicating repeated events
+            pending = {}
+            while True:
+                try:
+                    pending[self._inbox_queue.get_nowait()] = None
+                except queue.Empty:
+                    break
+            for file_path in pending:
+                if os.path.exists(file_path):
+                    self._process_injection_file(os.path.basename(file_path), file_path)
+            return
+
+        try:
+            with os.scandir(self.inbox_path) as entries:
+                pending = [
+                    (entry.name, entry.path) for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except FileNotFoundError:
             os.makedirs(self.inbox_path, exist_ok=True)
             return
 
-        for filename in os.listdir(self.inbox_path):
-            if filename.endswith(".json"):
-                file_path = os.path.join(self.inbox_path, filename)
-                try:
-                    with open(file_path, 'r') as f:
-                        injection_data = json.load(f)
+        for filename, file_path in pending:
+            self._process_injection_file(filename, file_path)
+
+    def _process_injection_file(self, filename: str, file_path: str):
+        """Parse, apply, archive and remove a single injection file."""
+        try:
+            with open(file_path, 'rb') as f:
+                injection_data = json_loads(f.read())
 
-                    logger.info(f"Hot Injection Detected: {filename}")
-                    self.apply_injection(injection_data)
+            logger.info("Hot Injection Detected: %s", filename)
+            self.apply_injection(injection_data)
 
-                    # Archive processed injection
-                    self._archive_injection(filename, injection_data)
-                    os.remove(file_path)
+            # Archive processed injection
+            self._archive_injection(filename, injection_data)
+            os.remove(file_path)
 
-                except Exception as e:
-                    logger.error(f"Error processing injection {filename}: {e}")
+        except Exception as e:
+            logger.error("Error processing injection %s: %s", filename, e)
 
     def apply_injection(self, data: Dict[str, Any]):
         """
@@ -179,63 +465,49 @@ class Simulation:
         if handler:
             handler(data)
         else:
-            logger.warning(f"Unknown injection type: {injection_type}")
+            logger.warning("Unknown injection type: %s", injection_type)
             self._handle_custom_injection(data)
 
+        # The world changed without a tick; a story for this tick must not reuse its old serialization
+        if self.narrator:
+            self.narrator.invalidate_world_cache()
+
+    def _injection_entity_data(self, injection_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build entity data for an add injection from its defaults and accepted payload keys."""
+        entity_data = dict(self._INJECTION_DEFAULTS[injection_type])
+        entity_data['id'] = data.get('id', f"injected_{data.get('name', 'unknown')}")
+        for key, field_name in self._INJECTION_FIELDS[injection_type].items():
+            if key in data:
+                entity_data[field_name] = data[key]
+        return entity_data
+
     def _handle_add_character(self, data: Dict[str, Any]):
         """Handle character addition injection."""
-        char_data = {
-            'id': data.get('id', f"injected_{data.get('name', 'unknown')}"),
-            'name': data.get('name', 'Unknown'),
-            'description': data.get('description', 'An injected character'),
-            'health': data.get('health', 100),
-            'energy': data.get('energy', 100),
-            'level': data.get('level', 1),
-            'attributes': data.get('attributes', {}),
-            'location': data.get('location')
-        }
+        char_data = self._injection_entity_data('add_character', data)
         self.world.create_character(char_data)
-        logger.info(f"Character injected: {char_data['name']}")
+        logger.info("Character injected: %s", char_data['name'])
 
     def _handle_remove_character(self, data: Dict[str, Any]):
         """Handle character removal injection."""
         char_id = data.get('character_id') or data.get('name')
         if char_id:
-            # Try to find by name first
+            # Looked up by id or name
             char = self.world.find_character_by_name(char_id)
             if char:
                 self.world.remove_character(char.id)
-            else:
-                self.world.remove_character(char_id)
-            logger.info(f"Character removed: {char_id}")
+            logger.info("Character removed: %s", char_id)
 
     def _handle_add_item(self, data: Dict[str, Any]):
         """Handle item addition injection."""
-        item_data = {
-            'id': data.get('id', f"injected_{data.get('name', 'unknown')}"),
-            'name': data.get('name', 'Unknown Item'),
-            'description': data.get('description', ''),
-            'item_type': data.get('type', 'generic'),
-            'rarity': data.get('rarity', 'common'),
-            'value': data.get('value', 0),
-            'attributes': data.get('attributes', {}),
-            'location': data.get('location')
-        }
+        item_data = self._injection_entity_data('add_item', data)
         self.world.create_item(item_data)
-        logger.info(f"Item injected: {item_data['name']}")
+        logger.info("Item injected: %s", item_data['name'])
 
     def _handle_add_location(self, data: Dict[str, Any]):
         """Handle location addition injection."""
-        loc_data = {
-            'id': data.get('id', f"injected_{data.get('name', 'unknown')}"),
-            'name': data.get('name', 'Unknown Location'),
-            'description': data.get('description', ''),
-            'location_type': data.get('type', 'generic'),
-            'connected_locations': data.get('connections', []),
-            'properties': data.get('properties', {})
-        }
+        loc_data = self._injection_entity_data('add_location', data)
         self.world.create_location(loc_data)
-        logger.info(f"Location injected: {loc_data['name']}")
+        logger.info("Location injected: %s", loc_data['name'])
 
     def _handle_modify_character(self, data: Dict[str, Any]):
         """Handle character modification injection."""
@@ -245,34 +517,38 @@ class Simulation:
 
         char = self.world.find_character_by_name(char_id)
         if not char:
-            if char_id in self.world.characters:
-                char = self.world.characters[char_id]
-            else:
-                logger.warning(f"Character not found for modification: {char_id}")
-                return
+            logger.warning("Character not found for modification: %s", char_id)
+            return
 
         # Apply modifications
         modifications = data.get('modifications', {})
+        settable = type(char)._SETTABLE_FIELDS
+        id_sets = type(char)._ID_SET_FIELDS
+        set_attribute = char.attributes.__setitem__
         for key, value in modifications.items():
-            if hasattr(char, key):
+            if key == 'location':
+                self.world.move_character(char, value)
+            elif key == 'name':
+                self.world.rename_character(char, value)
+            elif key in settable:
+                if key in id_sets and not isinstance(value, dict):
+                    value = dict.fromkeys(value)
                 setattr(char, key, value)
-            elif key in char.attributes:
-                char.attributes[key] = value
             else:
-                char.attributes[key] = value
+                set_attribute(key, value)
 
-        logger.info(f"Character modified: {char.name}")
+        logger.info("Character modified: %s", char.name)
 
     def _handle_trigger_event(self, data: Dict[str, Any]):
         """Handle manual event trigger injection."""
         event_type = data.get('event_type', 'custom_injection')
         event_data = data.get('data', {})
         self.event_bus.emit(event_type, event_data, source='injection')
-        logger.info(f"Event triggered: {event_type}")
+        logger.info("Event triggered: %s", event_type)
 
     def _handle_custom_injection(self, data: Dict[str, Any]):
         """Handle custom injection with arbitrary data."""
-        logger.info(f"Custom injection: {data}")
+        logger.info("Custom injection: %s", data)
         self.event_bus.emit(
             EventTypes.CUSTOM_INJECTION,
             data,
@@ -281,54 +557,135 @@ class Simulation:
 
     def _archive_injection(self, filename: str, data: Dict[str, Any]):
         """Archive processed injection to logs."""
-        archive_path = os.path.join("data/logs", "injections.log")
-        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        if self._archive_queue is None:
+            self._start_archive_writer()
+
+        header = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {filename}: ".encode()
+        self._archive_queue.put(header + json_dumps(data) + b"\n")
+
+    def _start_archive_writer(self):
+        """Start the thread that appends queued archive lines to the injection log."""
+        os.makedirs(os.path.dirname(self.archive_path), exist_ok=True)
+        self._archive_queue = queue.SimpleQueue()
+        self._archive_thread = threading.Thread(
+            target=self._archive_writer,
+            args=(self._archive_queue,),
+            name="injection-archive",
+            daemon=True
+        )
+        self._archive_thread.start()
 
-        with open(archive_path, 'a') as f:
-            f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {filename}: {json.dumps(data)}\n")
+    def _stop_archive_writer(self):
+        """Flush queued archive lines and stop the writer; it is restarted on the next injection."""
+        if self._archive_queue is None:
+            return
+        self._archive_queue.put(None)
+        self._archive_thread.join()
+        self._archive_queue = None
+        self._archive_thread = None
+
+    def _archive_writer(self, archive_queue: queue.SimpleQueue):
+        """Drain archive lines in batches through one long-lived file handle until None arrives."""
+        try:
+            with open(self.archive_path, 'ab', buffering=1 << 16) as f:
+                running = True
+                while running:
+                    batch = [archive_queue.get()]
+                    try:
+                        while len(batch) < self.ARCHIVE_BATCH_SIZE:
+                            batch.append(archive_queue.get_nowait())
+                    except queue.Empty:
+                        pass
+                    if None in batch:
+                        del batch[batch.index(None):]
+                        running = False
+                    f.writelines(batch)
+                    f.flush()
+        except OSError as e:
+            logger.error("Injection archive writer failed: %s", e)
 
     def _save_snapshot(self):
         """Save a snapshot of the current world state."""
         try:
             self.state_manager.save_snapshot(
-                self.world.get_state(),
+                self._get_state(),
                 self.world.world_id,
                 self.world.tick_count
             )
             self.last_save_tick = self.world.tick_count
         except Exception as e:
-            logger.error(f"Failed to save snapshot: {e}")
+            logger.error("Failed to save snapshot: %s", e)
 
     def _generate_story_segment(self):
-        """Generate a story segment from recent events."""
+        """Generate story segments for recent events and any queued windows right away."""
+        self._queue_story_window(flush=True)
+
+    def _queue_story_window(self, flush: bool = False):
+        """
+        Hand recent events to the narrator and queue their tick window.
+        Queued windows are narrated together once story_batch_size is reached.
+
+        Args:
+            flush: Narrate all queued windows immediately
+        """
         if not self.narrator:
             return
 
+        start_tick = self.world.tick_count - self.story_generation_interval
+
+        # Add events to narrator; it takes plain log dicts
+        self.narrator.add_logs([event._asdict() for event in self.world.get_events_since(start_tick)])
+
+        self._pending_story_windows.append((start_tick, self.world.tick_count))
+        if flush or len(self._pending_story_windows) >= self.story_batch_size:
+            self._flush_story_windows()
+
+    def _flush_story_windows(self):
+        """
+        Generate story segments for all queued windows in one narrator batch.
+        Inside the async loop the batch runs in a worker thread; otherwise it runs inline.
+        """
+        windows, self._pending_story_windows = self._pending_story_windows, []
+        if not windows:
+            return
+
         try:
-            # Add events to narrator
-            events = self.world.get_events_since(
-                self.world.tick_count - self.story_generation_interval
-            )
-            for event in events:
-                self.narrator.add_log(event)
-
-            # Generate story
-            start_tick = self.world.tick_count - self.story_generation_interval
-            segment = self.narrator.generate_story(
-                self.world,
-                start_tick,
-                self.world.tick_count
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None or self._llm_semaphore is None:
+            self._narrate_windows(self.world, windows)
+            return
+
+        # Snapshot the world here so the worker never iterates entity dicts mid-tick
+        task = loop.create_task(self._narrate_windows_async(self._get_state(), windows))
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
+
+    async def _narrate_windows_async(self, world_state: Dict[str, Any], windows: List[Tuple[int, int]]):
+        """Run a narrator batch in the default executor, bounded by the LLM semaphore."""
+        async with self._llm_semaphore:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._narrate_windows, world_state, windows
             )
 
-            if segment.content:
-                logger.info(f"Story generated: {segment.summary}")
+    def _narrate_windows(self, world_state: Any, windows: List[Tuple[int, int]]):
+        """Narrate tick windows and illustrate significant segments."""
+        try:
+            segments = self.narrator.generate_stories_batch(world_state, windows)
+
+            for segment in segments:
+                if not segment.content:
+                    continue
+                logger.info("Story generated: %s", segment.summary)
 
                 # Generate illustration for significant events
                 if self.illustrator and 'attack' in segment.metadata.get('events', []):
                     self.illustrator.generate_scene_illustration(segment)
 
         except Exception as e:
-            logger.error(f"Failed to generate story: {e}")
+            logger.error("Failed to generate story: %s", e)
 
     # Public API for external control
 
@@ -358,7 +715,7 @@ class Simulation:
         """
         data = self.state_manager.load_snapshot(snapshot_path)
         self._restore_world_state(data['world_state'])
-        logger.info(f"Game loaded from {snapshot_path}")
+        logger.info("Game loaded from %s", snapshot_path)
 
     def _restore_world_state(self, state: Dict[str, Any]):
         """Restore world state from saved data."""
@@ -366,20 +723,25 @@ class Simulation:
         self.world.characters.clear()
         self.world.items.clear()
         self.world.locations.clear()
-        self.world.event_log.clear()
+        self.world.clear_event_log()
 
         # Restore tick count
         self.world.tick_count = state.get('tick_count', 0)
-
-        # Restore entities
-        for char_id, char_data in state.get('characters', {}).items():
-            self.world.characters[char_id] = Character.from_dict(char_data)
-
-        for item_id, item_data in state.get('items', {}).items():
-            self.world.items[item_id] = Item.from_dict(item_data)
-
-        for loc_id, loc_data in state.get('locations', {}).items():
-            self.world.locations[loc_id] = Location.from_dict(loc_data)
+        self._reset_schedule()
+
+        # Restore entities; the world's dicts are updated in place so outside references stay valid
+        for target, entity_cls, key in (
+            (self.world.characters, Character, 'characters'),
+            (self.world.items, Item, 'items'),
+            (self.world.locations, Location, 'locations'),
+        ):
+            saved = state.get(key, {})
+            target.update(zip(saved.keys(), map(entity_cls.from_dict, saved.values())))
+        self.world.rebuild_indexes()
+        # Scheduled actions were due relative to the tick count before the restore
+        self.world.rebase_periodic_actions()
+        if self.narrator:
+            self.narrator.invalidate_world_cache()
 
     def list_snapshots(self) -> List[str]:
         """List available snapshots."""
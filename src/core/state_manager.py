@@ -1,7 +1,11 @@
+import json
 import pickle
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Optional, List
+from typing import Any, Dict, Optional, List, Set
 from src.utils.logger import logger
 
 
@@ -9,51 +13,232 @@ class StateManager:
     """
     Manages save/load/snapshot/rollback functionality for the simulation.
     Implements the "Time Machine" feature for world state persistence.
+
+    Snapshots of a world form a chain: a full baseline is written every
+    full_snapshot_interval saves, and the saves in between are ``*.delta.pkl``
+    files holding only the entities that changed since the previous snapshot.
+    Deleting a snapshot first rewrites the delta snapshots that chain from it
+    as full baselines, so they stay loadable. If a write fails, the deltas
+    queued after it are dropped too and the next save starts a new baseline.
     """
 
-    def __init__(self, snapshot_dir: str = "data/snapshots"):
+    # World state sections that are diffed per entity in delta snapshots
+    ENTITY_SECTIONS = ('characters', 'items', 'locations')
+
+    def __init__(
+        self,
+        snapshot_dir: str = "data/snapshots",
+        full_snapshot_interval: int = 10,
+        cache_size: int = 8
+    ):
         self.snapshot_dir = snapshot_dir
+        self.full_snapshot_interval = full_snapshot_interval
+        self.cache_size = cache_size
         self._ensure_snapshot_dir()
 
+        # Snapshots are pickled by the caller and written to disk by a single background writer
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-writer")
+        self._pending_writes: Dict[str, Future] = {}
+
+        # Per world: last snapshot path, saves since its baseline, and the pickled entities it holds
+        self._chains: Dict[str, Dict[str, Any]] = {}
+
+        # Most recent snapshot per world, mirrored to a sidecar file; loaded on first use
+        self._latest_path = os.path.join(self.snapshot_dir, "latest.json")
+        self._latest: Optional[Dict[str, str]] = None
+
+        # Pickled bytes of recently saved or loaded snapshot files, least recently used first.
+        # Bytes rather than dicts, so every load still returns fresh objects.
+        self._snapshot_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+        # Snapshot files whose write failed; deltas chaining from them are not written either
+        self._failed_writes: Set[str] = set()
+
+        # Guards the chain, cache and write bookkeeping, which the writer thread updates
+        self._lock = threading.Lock()
+
     def _ensure_snapshot_dir(self):
         """Ensure the snapshot directory exists."""
         os.makedirs(self.snapshot_dir, exist_ok=True)
 
-    def _generate_snapshot_filename(self, world_id: str, tick: int) -> str:
-        """Generate a standardized snapshot filename."""
+    def _generate_snapshot_filename(self, world_id: str, tick: int, delta: bool = False) -> str:
+        """Generate a standardized, unused snapshot filename."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return os.path.join(
-            self.snapshot_dir,
-            f"{world_id}_tick_{tick}_{timestamp}.pkl"
-        )
+        suffix = ".delta.pkl" if delta else ".pkl"
+        # Zero-padded ticks keep lexicographic order equal to tick order
+        base = os.path.join(self.snapshot_dir, f"{world_id}_tick_{tick:012d}_{timestamp}")
+        filename = base + suffix
+        # Never overwrite a snapshot that a delta chain may still point at
+        counter = 1
+        while filename in self._pending_writes or os.path.exists(filename):
+            filename = f"{base}_{counter}{suffix}"
+            counter += 1
+        return filename
 
     def save_snapshot(self, world_state: Any, world_id: str, tick: int) -> str:
         """
         Save a snapshot of the current world state.
 
+        The state is pickled immediately, so later mutations do not leak into the
+        snapshot; the file itself is written in the background. Call flush() to
+        wait for pending writes.
+
         Args:
             world_state: The world state object to serialize
             world_id: Unique identifier for the world
             tick: Current simulation tick number
 
         Returns:
-            Path to the saved snapshot file
+            Path the snapshot is being written to
         """
-        filename = self._generate_snapshot_filename(world_id, tick)
         try:
-            with open(filename, 'wb') as f:
-                pickle.dump({
-                    'world_state': world_state,
-                    'world_id': world_id,
-                    'tick': tick,
-                    'timestamp': datetime.now().isoformat()
-                }, f)
+            # Entities are pickled once: the blobs are both diffed and stored in the payload
+            entities = self._pickle_entities(world_state)
+            header = {
+                'world_id': world_id,
+                'tick': tick,
+                'timestamp': datetime.now().isoformat()
+            }
+            with self._lock:
+                chain = self._chains.get(world_id)
+                prev = None
+                if entities is None:
+                    filename = self._generate_snapshot_filename(world_id, tick)
+                    header['world_state'] = world_state
+                else:
+                    # Non-entity fields (tick count, config, event log) are small and stored whole
+                    fields = {key: value for key, value in world_state.items() if key not in entities}
+                    if chain is not None and chain['saves'] + 1 < self.full_snapshot_interval:
+                        filename = self._generate_snapshot_filename(world_id, tick, delta=True)
+                        prev = header['prev'] = chain['path']
+                        header['delta'] = {
+                            'fields': fields,
+                            'entities': self._diff_entities(entities, chain['entities'])
+                        }
+                        saves = chain['saves'] + 1
+                    else:
+                        filename = self._generate_snapshot_filename(world_id, tick)
+                        header['state'] = {'fields': fields, 'entities': entities}
+                        saves = 0
+                payload = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+
+                if entities is not None:
+                    self._chains[world_id] = {'path': filename, 'saves': saves, 'entities': entities}
+
+                self._cache_snapshot(filename, payload)
+                latest = self._load_latest()
+                latest[world_id] = filename
+                future = self._writer.submit(self._write_snapshot, filename, payload, tick, dict(latest), prev)
+                self._pending_writes[filename] = future
+        except Exception as e:
+            logger.error(f"Failed to save snapshot: {e}")
+            raise
+
+        future.add_done_callback(lambda f: self._on_write_done(world_id, filename, f))
+        return filename
+
+    def _on_write_done(self, world_id: str, filename: str, future: Future):
+        """Forget a finished write; a failed one forces the next save to be a full baseline."""
+        with self._lock:
+            self._pending_writes.pop(filename, None)
+            if future.exception() is not None:
+                self._failed_writes.add(filename)
+                self._snapshot_cache.pop(filename, None)
+                # Later deltas chain from this file and fail in turn, resetting the chain then
+                chain = self._chains.get(world_id)
+                if chain is not None and chain['path'] == filename:
+                    del self._chains[world_id]
+
+    def _cache_snapshot(self, snapshot_path: str, payload: bytes):
+        """Remember a snapshot file's bytes, evicting the least recently used entries; caller holds _lock."""
+        cache = self._snapshot_cache
+        cache[snapshot_path] = payload
+        cache.move_to_end(snapshot_path)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def _pickle_entities(self, world_state: Any) -> Optional[Dict[str, Dict[str, bytes]]]:
+        """
+        Pickle each entity of a world state on its own so saves can be diffed.
+
+        Returns:
+            Pickled entities per section, or None if the state has no entity sections
+        """
+        if not isinstance(world_state, dict):
+            return None
+        pickled = {}
+        for section in self.ENTITY_SECTIONS:
+            entities = world_state.get(section)
+            if not isinstance(entities, dict):
+                return None
+            pickled[section] = {
+                entity_id: pickle.dumps(entity, protocol=pickle.HIGHEST_PROTOCOL)
+                for entity_id, entity in entities.items()
+            }
+        return pickled
+
+    def _diff_entities(self, entities: Dict[str, Dict[str, bytes]],
+                       previous: Dict[str, Dict[str, bytes]]) -> dict:
+        """Build the per-section changes between pickled entities and the previously saved ones."""
+        sections = {}
+        for section, current in entities.items():
+            before = previous.get(section, {})
+            sections[section] = {
+                'changed': {
+                    entity_id: blob for entity_id, blob in current.items()
+                    if before.get(entity_id) != blob
+                },
+                'removed': [entity_id for entity_id in before if entity_id not in current]
+            }
+        return sections
+
+    def _write_snapshot(self, filename: str, payload: bytes, tick: int, latest: Dict[str, str],
+                        prev: Optional[str] = None):
+        """Write pickled snapshot bytes and the latest-snapshot sidecar; runs on the writer thread."""
+        if prev is not None and prev in self._failed_writes:
+            # Writes run in order, so a failed base has already been recorded
+            logger.error(f"Snapshot {filename} not saved: its base {prev} failed to save")
+            raise OSError(f"base snapshot {prev} was not saved")
+
+        temp_path = filename + ".tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+            # Readers never observe a partially written snapshot
+            os.replace(temp_path, filename)
             logger.info(f"Snapshot saved: {filename} (tick {tick})")
-            return filename
         except Exception as e:
             logger.error(f"Failed to save snapshot: {e}")
             raise
 
+        temp_path = self._latest_path + ".tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(latest, f)
+            os.replace(temp_path, self._latest_path)
+        except OSError as e:
+            logger.warning(f"Failed to update latest snapshot index: {e}")
+
+    def _load_latest(self) -> Dict[str, str]:
+        """Return the latest-snapshot index, reading the sidecar file on first use."""
+        if self._latest is None:
+            try:
+                with open(self._latest_path, 'r') as f:
+                    self._latest = json.load(f)
+            except (OSError, ValueError):
+                self._latest = {}
+        return self._latest
+
+    def flush(self):
+        """Block until all pending snapshot writes have finished."""
+        with self._lock:
+            pending = list(self._pending_writes.values())
+        for future in pending:
+            try:
+                future.result()
+            except Exception:
+                pass  # Already logged by the writer
+
     def load_snapshot(self, snapshot_path: str) -> dict:
         """
         Load a world state from a snapshot file.
@@ -65,14 +250,54 @@ class StateManager:
             Dictionary containing world_state, world_id, tick, and timestamp
         """
         try:
-            with open(snapshot_path, 'rb') as f:
-                data = pickle.load(f)
+            data = self._read_snapshot(snapshot_path)
             logger.info(f"Snapshot loaded: {snapshot_path} (tick {data['tick']})")
             return data
         except Exception as e:
             logger.error(f"Failed to load snapshot: {e}")
             raise
 
+    def _read_snapshot(self, snapshot_path: str) -> dict:
+        """Read a snapshot file, replaying delta snapshots onto their baseline."""
+        with self._lock:
+            payload = self._snapshot_cache.get(snapshot_path)
+        if payload is None:
+            self.flush()
+            with open(snapshot_path, 'rb') as f:
+                payload = f.read()
+        with self._lock:
+            self._cache_snapshot(snapshot_path, payload)
+        data = pickle.loads(payload)
+        if 'state' in data:
+            # Baseline with pickled entities
+            state = data.pop('state')
+            world_state = dict(state['fields'])
+            for section, blobs in state['entities'].items():
+                world_state[section] = {entity_id: pickle.loads(blob) for entity_id, blob in blobs.items()}
+            data['world_state'] = world_state
+            return data
+        if 'delta' not in data:
+            return data
+
+        base = self._read_snapshot(data['prev'])
+        world_state = dict(base['world_state'])
+        delta = data['delta']
+        world_state.update(delta['fields'])
+        for section, changes in delta['entities'].items():
+            entities = dict(world_state.get(section, {}))
+            for entity_id in changes['removed']:
+                entities.pop(entity_id, None)
+            for entity_id, blob in changes['changed'].items():
+                entities[entity_id] = pickle.loads(blob)
+            world_state[section] = entities
+
+        return {
+            'world_state': world_state,
+            'world_id': data['world_id'],
+            'tick': data['tick'],
+            'timestamp': data['timestamp']
+        }
+
     def list_snapshots(self, world_id: Optional[str] = None) -> List[str]:
         """
         List available snapshots.
@@ -83,15 +308,18 @@ class StateManager:
         Returns:
             List of snapshot file paths
         """
-        if not os.path.exists(self.snapshot_dir):
+        self.flush()
+        try:
+            with os.scandir(self.snapshot_dir) as entries:
+                snapshots = [
+                    entry.path for entry in entries
+                    if entry.name.endswith('.pkl')
+                    and (world_id is None or entry.name.startswith(world_id))
+                    and entry.is_file(follow_symlinks=False)
+                ]
+        except FileNotFoundError:
             return []
 
-        snapshots = []
-        for filename in os.listdir(self.snapshot_dir):
-            if filename.endswith('.pkl'):
-                if world_id is None or filename.startswith(world_id):
-                    snapshots.append(os.path.join(self.snapshot_dir, filename))
-
         return sorted(snapshots)
 
     def get_latest_snapshot(self, world_id: str) -> Optional[str]:
@@ -102,10 +330,24 @@ class StateManager:
             world_id: World ID to find snapshots for
 
         Returns:
-            Path to the latest snapshot, or None if not found
+            Path to the latest snapshot, or None if not found. The file may still
+            be queued for writing; load_snapshot() waits for it.
         """
-        snapshots = self.list_snapshots(world_id)
-        return snapshots[-1] if snapshots else None
+        path = self._load_latest().get(world_id)
+        if path is not None and (path in self._pending_writes or os.path.exists(path)):
+            return path
+
+        # No usable index entry: take the highest tick on disk
+        prefix = f"{world_id}_tick_"
+        try:
+            with os.scandir(self.snapshot_dir) as entries:
+                return max(
+                    (entry.path for entry in entries
+                     if entry.name.startswith(prefix) and entry.name.endswith('.pkl')),
+                    default=None
+                )
+        except FileNotFoundError:
+            return None
 
     def delete_snapshot(self, snapshot_path: str) -> bool:
         """
@@ -117,6 +359,22 @@ class StateManager:
         Returns:
             True if deleted successfully, False otherwise
         """
+        self.flush()
+        try:
+            # Deltas chaining from this file would become unloadable; make them self-contained first
+            for dependent in self._dependent_snapshots(snapshot_path):
+                self._rewrite_as_baseline(dependent)
+        except Exception as e:
+            logger.error(f"Failed to delete snapshot {snapshot_path}: could not rewrite its dependents: {e}")
+            return False
+
+        target = os.path.abspath(snapshot_path)
+        with self._lock:
+            self._snapshot_cache.pop(snapshot_path, None)
+            # New deltas must not chain from the deleted file
+            for world_id, chain in list(self._chains.items()):
+                if os.path.abspath(chain['path']) == target:
+                    del self._chains[world_id]
         try:
             os.remove(snapshot_path)
             logger.info(f"Snapshot deleted: {snapshot_path}")
@@ -125,6 +383,51 @@ class StateManager:
             logger.error(f"Failed to delete snapshot: {e}")
             return False
 
+    def _dependent_snapshots(self, snapshot_path: str) -> List[str]:
+        """Return the delta snapshots whose prev is the given snapshot."""
+        target = os.path.abspath(snapshot_path)
+        dependents = []
+        try:
+            with os.scandir(self.snapshot_dir) as entries:
+                paths = [entry.path for entry in entries if entry.name.endswith('.delta.pkl')]
+        except FileNotFoundError:
+            return dependents
+        for path in paths:
+            with self._lock:
+                payload = self._snapshot_cache.get(path)
+            if payload is None:
+                with open(path, 'rb') as f:
+                    payload = f.read()
+            prev = pickle.loads(payload).get('prev')
+            if prev is not None and os.path.abspath(prev) == target:
+                dependents.append(path)
+        return dependents
+
+    def _rewrite_as_baseline(self, snapshot_path: str):
+        """Replace a delta snapshot's file with a full baseline of the same state; it keeps its name."""
+        data = self._read_snapshot(snapshot_path)
+        world_state = data['world_state']
+        header = {
+            'world_id': data['world_id'],
+            'tick': data['tick'],
+            'timestamp': data['timestamp']
+        }
+        entities = self._pickle_entities(world_state)
+        if entities is None:
+            header['world_state'] = world_state
+        else:
+            fields = {key: value for key, value in world_state.items() if key not in entities}
+            header['state'] = {'fields': fields, 'entities': entities}
+        payload = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+
+        temp_path = snapshot_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, snapshot_path)
+        with self._lock:
+            self._cache_snapshot(snapshot_path, payload)
+        logger.info(f"Snapshot rewritten as a full baseline: {snapshot_path}")
+
     def rollback(self, world_state: Any, snapshot_path: str) -> Any:
         """
         Rollback to a previous snapshot state.
@@ -1,9 +1,26 @@
 from typing import Dict, List, Any, Optional
+import copy
 import sys
 from src.core.entities import Character, Item, Location
 from src.modules.world_mod.actions import ActionRegistry, ActionResult
 from src.utils.logger import logger
 
+# Starter item templates (name, item_type, attributes) per class choice; any other choice gets the Rogue kit
+_STARTER_ITEMS = {
+    '1': (  # Warrior
+        ("Iron Sword", "weapon", {'damage': 10, 'equipped': True}),
+        ("Health Potion", "consumable", {'effects': {'heal': 50}}),
+    ),
+    '2': (  # Mage
+        ("Wooden Staff", "weapon", {'damage': 5, 'equipped': True}),
+        ("Energy Potion", "consumable", {'effects': {'energy': 50}}),
+    ),
+    '3': (  # Rogue
+        ("Dagger", "weapon", {'damage': 8, 'equipped': True}),
+        ("Bandage", "consumable", {'effects': {'heal': 30}}),
+    ),
+}
+
 
 class TextRPG:
     """
@@ -11,11 +28,36 @@ class TextRPG:
     Provides an interactive command-line game experience.
     """
 
+    # Command word -> handler method name, built once for all instances
+    _COMMANDS: Dict[str, str] = {
+        'help': '_cmd_help',
+        'status': '_cmd_status',
+        'look': '_cmd_look',
+        'go': '_cmd_go',
+        'move': '_cmd_go',
+        'inventory': '_cmd_inventory',
+        'inv': '_cmd_inventory',
+        'use': '_cmd_use',
+        'talk': '_cmd_talk',
+        'attack': '_cmd_attack',
+        'rest': '_cmd_rest',
+        'save': '_cmd_save',
+        'load': '_cmd_load',
+        'quit': '_cmd_quit',
+        'exit': '_cmd_quit'
+    }
+
     def __init__(self, world_state: Any):
         self.world_state = world_state
+        # Entity dicts resolved once; the world updates them in place (e.g. on snapshot restore)
+        self._locations: Dict[str, Location] = getattr(world_state, 'locations', {})
+        self._characters: Dict[str, Character] = getattr(world_state, 'characters', {})
+        self._items: Dict[str, Item] = getattr(world_state, 'items', {})
         self.player: Optional[Character] = None
         self._running = False
         self._command_history: List[str] = []
+        # Lowercased location id/name -> location id; rebuilt when a lookup misses or goes stale
+        self._location_index: Dict[str, str] = {}
 
     def start(self, player_character: Optional[Character] = None):
         """Start the text RPG."""
@@ -45,45 +87,48 @@ class TextRPG:
 
     def _game_loop(self):
         """Main game loop."""
+        # input() adds line editing on a terminal; piped commands are read directly
+        read_command = self._input_command if sys.stdin.isatty() else self._read_piped_command
+        record = self._command_history.append
+        process = self._process_command
         while self._running:
             try:
-                command = input("> ").strip()
+                command = read_command().strip()
                 if command:
-                    self._command_history.append(command)
-                    self._process_command(command)
+                    record(command)
+                    process(command)
             except KeyboardInterrupt:
                 print("\nUse 'quit' to exit.")
             except EOFError:
                 self.stop()
                 break
 
+    @staticmethod
+    def _input_command() -> str:
+        """Prompt for a command on an interactive terminal."""
+        return input("> ")
+
+    @staticmethod
+    def _read_piped_command() -> str:
+        """Read a command from non-interactive stdin without input()'s per-call overhead."""
+        sys.stdout.write("> ")
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line
+
     def _process_command(self, command: str):
         """Process a player command."""
         parts = command.split(maxsplit=1)
-        cmd = parts[0].lower()
+        cmd = parts[0]
+        if not cmd.islower():
+            cmd = cmd.lower()
         args = parts[1] if len(parts) > 1 else ""
 
-        commands = {
-            'help': self._cmd_help,
-            'status': self._cmd_status,
-            'look': self._cmd_look,
-            'go': self._cmd_go,
-            'move': self._cmd_go,
-            'inventory': self._cmd_inventory,
-            'inv': self._cmd_inventory,
-            'use': self._cmd_use,
-            'talk': self._cmd_talk,
-            'attack': self._cmd_attack,
-            'rest': self._cmd_rest,
-            'save': self._cmd_save,
-            'load': self._cmd_load,
-            'quit': self._cmd_quit,
-            'exit': self._cmd_quit
-        }
-
-        handler = commands.get(cmd)
-        if handler:
-            handler(args)
+        handler_name = self._COMMANDS.get(cmd)
+        if handler_name:
+            getattr(self, handler_name)(args)
         else:
             print(f"Unknown command: {cmd}. Type 'help' for commands.")
 
@@ -113,13 +158,16 @@ Available Commands:
         if not self.player:
             return
 
-        print(f"\n--- {self.player.name} ---")
-        print(f"Health: {self.player.health}/100")
-        print(f"Energy: {self.player.energy}/100")
-        print(f"Level: {self.player.level} (EXP: {self.player.experience})")
-        print(f"Location: {self.player.location or 'Unknown'}")
-        print(f"Status: {self.player.status}")
-        print()
+        player = self.player
+        sys.stdout.write(
+            f"\n--- {player.name} ---\n"
+            f"Health: {player.health}/100\n"
+            f"Energy: {player.energy}/100\n"
+            f"Level: {player.level} (EXP: {player.experience})\n"
+            f"Location: {player.location or 'Unknown'}\n"
+            f"Status: {player.status}\n"
+            "\n"
+        )
 
     def _cmd_look(self, args: str):
         """Examine current location."""
@@ -127,44 +175,43 @@ Available Commands:
             print("You are nowhere. Everything is dark.")
             return
 
-        locations = getattr(self.world_state, 'locations', {})
+        locations = self._locations
         location = locations.get(self.player.location)
 
         if not location:
             print(f"You are at {self.player.location}, but details are unclear.")
             return
 
-        print(f"\n=== {location.name} ===")
-        print(location.description)
+        # Build the whole description and write it once
+        lines = [f"\n=== {location.name} ===", location.description]
 
         # Show characters here
         if location.characters:
-            print("\nCharacters present:")
-            characters = getattr(self.world_state, 'characters', {})
-            for char_id in location.characters:
-                char = characters.get(char_id)
-                if char and char.id != self.player.id:
-                    rel = self.player.get_relationship(char.id)
-                    rel_str = f"(Relationship: {rel})" if rel != 0 else ""
-                    print(f"  - {char.name} {rel_str}")
+            lines.append("\nCharacters present:")
+            characters = self._characters
+            player_id = self.player.id
+            get_relationship = self.player.get_relationship
+            for char in [characters[char_id] for char_id in location.characters
+                         if char_id != player_id and char_id in characters]:
+                rel = get_relationship(char.id)
+                rel_str = f"(Relationship: {rel})" if rel != 0 else ""
+                lines.append(f"  - {char.name} {rel_str}")
 
         # Show items here
         if location.items:
-            print("\nItems on the ground:")
-            items = getattr(self.world_state, 'items', {})
-            for item_id in location.items:
-                item = items.get(item_id)
-                if item:
-                    print(f"  - {item.name}")
+            lines.append("\nItems on the ground:")
+            items = self._items
+            lines.extend([f"  - {items[item_id].name}" for item_id in location.items if item_id in items])
 
         # Show exits
         if location.connected_locations:
-            print("\nExits:")
-            for loc_id in location.connected_locations:
-                loc = locations.get(loc_id)
-                if loc:
-                    print(f"  - {loc.name}")
-        print()
+            lines.append("\nExits:")
+            lines.extend([
+                f"  - {locations[loc_id].name}"
+                for loc_id in dict.fromkeys(location.connected_locations) if loc_id in locations
+            ])
+        lines.append("\n")
+        sys.stdout.write("\n".join(lines))
 
     def _cmd_go(self, args: str):
         """Move to a location."""
@@ -176,25 +223,34 @@ Available Commands:
             return
 
         # Find location by name or ID
-        locations = getattr(self.world_state, 'locations', {})
-        target = None
-        for loc_id, loc in locations.items():
-            if loc_id.lower() == args.lower() or loc.name.lower() == args.lower():
-                target = loc_id
-                break
-
+        target = self._find_location_id(args)
         if not target:
             print(f"Cannot find '{args}'.")
             return
 
         # Execute move action
-        action = ActionRegistry.create('move', self.player, target)
-        if action:
-            result = action.execute(self.world_state)
+        result = ActionRegistry.execute('move', self.world_state, self.player, target)
+        if result is not None:
             self._print_action_result(result)
         else:
             print("Cannot perform that action.")
 
+    def _find_location_id(self, name: str) -> Optional[str]:
+        """Resolve a location name or ID (case-insensitive) to its ID."""
+        locations = self._locations
+        key = name.lower()
+
+        loc_id = self._location_index.get(key)
+        loc = locations.get(loc_id) if loc_id else None
+        if loc is not None and key in (loc_id.lower(), loc.name.lower()):
+            return loc_id
+
+        # Miss or stale entry: the world changed since the index was built
+        index = {loc.name.lower(): loc_id for loc_id, loc in locations.items()}
+        index.update((loc_id.lower(), loc_id) for loc_id in locations)
+        self._location_index = index
+        return index.get(key)
+
     def _cmd_inventory(self, args: str):
         """Show inventory."""
         if not self.player:
@@ -204,7 +260,7 @@ Available Commands:
         if not self.player.inventory:
             print("Your inventory is empty.")
         else:
-            items = getattr(self.world_state, 'items', {})
+            items = self._items
             for item_id in self.player.inventory:
                 item = items.get(item_id)
                 if item:
@@ -222,11 +278,12 @@ Available Commands:
             return
 
         # Find item in inventory
-        items = getattr(self.world_state, 'items', {})
+        items = self._items
+        wanted = args.lower()
         target_item = None
         for item_id in self.player.inventory:
             item = items.get(item_id)
-            if item and item.name.lower() == args.lower():
+            if item and item.name.lower() == wanted:
                 target_item = item
                 break
 
@@ -234,9 +291,8 @@ Available Commands:
             print(f"You don't have '{args}'.")
             return
 
-        action = ActionRegistry.create('use_item', self.player, target_item)
-        if action:
-            result = action.execute(self.world_state)
+        result = ActionRegistry.execute('use_item', self.world_state, self.player, target_item)
+        if result is not None:
             self._print_action_result(result)
         else:
             print("Cannot use that item.")
@@ -263,17 +319,18 @@ Available Commands:
             return
 
         # Find character in current location
-        locations = getattr(self.world_state, 'locations', {})
+        locations = self._locations
         location = locations.get(self.player.location)
 
         if not location:
             return
 
-        characters = getattr(self.world_state, 'characters', {})
+        characters = self._characters
+        wanted = name.lower()
         target = None
         for char_id in location.characters:
             char = characters.get(char_id)
-            if char and char.name.lower() == name.lower() and char.id != self.player.id:
+            if char and char.name.lower() == wanted and char.id != self.player.id:
                 target = char
                 break
 
@@ -281,9 +338,8 @@ Available Commands:
             print(f"Cannot find '{name}' here.")
             return
 
-        action = ActionRegistry.create(interaction_type, self.player, target)
-        if action:
-            result = action.execute(self.world_state)
+        result = ActionRegistry.execute(interaction_type, self.world_state, self.player, target)
+        if result is not None:
             self._print_action_result(result)
         else:
             print(f"Cannot {interaction_type} with {name}.")
@@ -293,9 +349,8 @@ Available Commands:
         if not self.player:
             return
 
-        action = ActionRegistry.create('rest', self.player)
-        if action:
-            result = action.execute(self.world_state)
+        result = ActionRegistry.execute('rest', self.world_state, self.player)
+        if result is not None:
             self._print_action_result(result)
         else:
             print("Cannot rest here.")
@@ -353,7 +408,7 @@ Available Commands:
         for item in starter_items:
             character.add_item(item.id)
             # Add items to world state
-            items = getattr(self.world_state, 'items', {})
+            items = self._items
             items[item.id] = item
 
         print(f"\nWelcome, {name}! Your adventure begins...")
@@ -361,47 +416,16 @@ Available Commands:
 
     def _get_starter_items(self, class_choice: str) -> List[Item]:
         """Get starter items based on class choice."""
-        items = []
-
-        if class_choice == '1':  # Warrior
-            items.append(Item(
-                name="Iron Sword",
-                item_type="weapon",
-                attributes={'damage': 10, 'equipped': True}
-            ))
-            items.append(Item(
-                name="Health Potion",
-                item_type="consumable",
-                attributes={'effects': {'heal': 50}}
-            ))
-        elif class_choice == '2':  # Mage
-            items.append(Item(
-                name="Wooden Staff",
-                item_type="weapon",
-                attributes={'damage': 5, 'equipped': True}
-            ))
-            items.append(Item(
-                name="Energy Potion",
-                item_type="consumable",
-                attributes={'effects': {'energy': 50}}
-            ))
-        else:  # Rogue
-            items.append(Item(
-                name="Dagger",
-                item_type="weapon",
-                attributes={'damage': 8, 'equipped': True}
-            ))
-            items.append(Item(
-                name="Bandage",
-                item_type="consumable",
-                attributes={'effects': {'heal': 30}}
-            ))
-
-        # Assign IDs
-        for i, item in enumerate(items):
-            item.id = f"starter_item_{i}"
-
-        return items
+        templates = _STARTER_ITEMS.get(class_choice, _STARTER_ITEMS['3'])
+        return [
+            Item(
+                id=f"starter_item_{i}",
+                name=name,
+                item_type=item_type,
+                attributes=copy.deepcopy(attributes)
+            )
+            for i, (name, item_type, attributes) in enumerate(templates)
+        ]
 
 
 def run_text_rpg(world_state: Any):
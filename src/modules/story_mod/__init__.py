@@ -4,8 +4,16 @@ RIWA2 Story Module
 Story generation and illustration.
 """
 
-from src.modules.story_mod.narrator import Narrator, StorySegment
-from src.modules.story_mod.illustrator import Illustrator, ImageGeneration
+import importlib
+
+# Exported name -> defining submodule; loaded on first access (PEP 562) so that
+# importing one submodule does not pull in the other (narrator needs jinja2)
+_EXPORTS = {
+    "Narrator": "src.modules.story_mod.narrator",
+    "StorySegment": "src.modules.story_mod.narrator",
+    "Illustrator": "src.modules.story_mod.illustrator",
+    "ImageGeneration": "src.modules.story_mod.illustrator"
+}
 
 __all__ = [
     "Narrator",
@@ -13,3 +21,16 @@ __all__ = [
     "Illustrator",
     "ImageGeneration"
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,12 +1,72 @@
-from typing import Dict, List, Any, Optional
+from typing import ClassVar, Dict, List, Any, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 import os
 import base64
+from src.utils.compat import DATACLASS_SLOTS
 from src.utils.logger import logger
 
 
-@dataclass
+# Static page around the gallery's image cards
+_GALLERY_HEAD = '''<!DOCTYPE html>
+<html>
+<head>
+    <title>RIWA2 Image Gallery</title>
+    <style>
+        body { font-family: Arial, sans-serif; background: #1a1a2e; color: #eee; padding: 20px; }
+        h1 { text-align: center; color: #e94560; }
+        .gallery { display: grid; grid-template-columns: repeat(auto-fill, minmax(300px, 1fr)); gap: 20px; }
+        .image-card { background: #16213e; border-radius: 8px; overflow: hidden; }
+        .image-card img { width: 100%; height: 300px; object-fit: cover; }
+        .prompt { padding: 10px; font-size: 14px; color: #aaa; }
+        .meta { padding: 0 10px 10px; font-size: 12px; color: #666; }
+    </style>
+</head>
+<body>
+    <h1>RIWA2 Illustration Gallery</h1>
+    <div class="gallery">'''
+
+_GALLERY_TAIL = '''</div>
+</body>
+</html>'''
+
+# Scene label indexed by a 3-bit key: battle (4) | interaction (2) | introduction (1).
+# The highest set bit decides, matching the old if/elif priority.
+_SCENE_LABELS = (
+    "narrative scene",         # 0
+    "character introduction",  # 1
+    "character interaction",   # 2
+    "character interaction",   # 3
+    "intense battle scene",    # 4
+    "intense battle scene",    # 5
+    "intense battle scene",    # 6
+    "intense battle scene",    # 7
+)
+
+# Placeholder image used when no image API is configured
+_SVG_PLACEHOLDER = '''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">
+  <defs>
+    <linearGradient id="bg" x1="0%" y1="0%" x2="100%" y2="100%">
+      <stop offset="0%" style="stop-color:#1a1a2e;stop-opacity:1" />
+      <stop offset="100%" style="stop-color:#16213e;stop-opacity:1" />
+    </linearGradient>
+  </defs>
+  <rect width="100%" height="100%" fill="url(#bg)"/>
+  <text x="50%" y="45%" text-anchor="middle" fill="#e94560" font-size="24" font-family="Arial">
+    [Image Placeholder]
+  </text>
+  <text x="50%" y="55%" text-anchor="middle" fill="#ffffff" font-size="14" font-family="Arial">
+    Style: {style}
+  </text>
+  <text x="50%" y="70%" text-anchor="middle" fill="#aaaaaa" font-size="12" font-family="Arial">
+    {prompt}
+  </text>
+</svg>'''
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ImageGeneration:
     """Represents a generated image."""
     prompt: str
@@ -18,6 +78,9 @@ class ImageGeneration:
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
 
+    # Directories already created by save(), shared by all generations
+    _ensured_dirs: ClassVar[Set[str]] = set()
+
     def to_dict(self) -> dict:
         return {
             'prompt': self.prompt,
@@ -33,14 +96,30 @@ class ImageGeneration:
         """Save image to file."""
         if self.image_data:
             path = filepath or self.image_path or f"data/snapshots/image_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, 'wb') as f:
+            directory = os.path.dirname(path)
+            if directory and directory not in ImageGeneration._ensured_dirs:
+                os.makedirs(directory, exist_ok=True)
+                ImageGeneration._ensured_dirs.add(directory)
+            try:
+                f = open(path, 'wb')
+            except FileNotFoundError:
+                # Directory removed since it was cached
+                os.makedirs(directory, exist_ok=True)
+                f = open(path, 'wb')
+            with f:
                 f.write(self.image_data)
             self.image_path = path
             logger.info(f"Image saved to {path}")
             return path
         return None
 
+    def reload(self) -> Optional[bytes]:
+        """Read the image bytes back from image_path if they are not held in memory."""
+        if self.image_data is None and self.image_path:
+            with open(self.image_path, 'rb') as f:
+                self.image_data = f.read()
+        return self.image_data
+
 
 class Illustrator:
     """
@@ -52,11 +131,13 @@ class Illustrator:
         self,
         output_dir: str = "data/snapshots/illustrations",
         api_client: Optional[Any] = None,
-        default_style: str = "digital_art"
+        default_style: str = "digital_art",
+        batch_parallelism: int = 4
     ):
         self.output_dir = output_dir
         self.api_client = api_client
         self.default_style = default_style
+        self.batch_parallelism = batch_parallelism  # Concurrent API requests in generate_batch()
         self._generations: List[ImageGeneration] = []
 
         os.makedirs(output_dir, exist_ok=True)
@@ -73,6 +154,10 @@ class Illustrator:
             'cyberpunk': "cyberpunk style, neon lights, futuristic, dark atmosphere",
             'fantasy': "fantasy art, magical, ethereal lighting"
         }
+        # Complete prompt suffix per preset; edits to style_presets after construction are not picked up
+        self._style_suffixes = {
+            name: f", {keywords}, high quality, detailed" for name, keywords in self.style_presets.items()
+        }
 
     def generate_image(
         self,
@@ -95,6 +180,68 @@ class Illustrator:
         Returns:
             ImageGeneration object or None if failed
         """
+        generation = self._create_generation(prompt, style, width, height)
+
+        if generation and save:
+            self._persist(generation)
+
+        if generation:
+            self._generations.append(generation)
+
+        return generation
+
+    def generate_batch(
+        self,
+        requests: List[Tuple[str, Optional[str]]],
+        width: int = 512,
+        height: int = 512,
+        save: bool = True
+    ) -> List[Optional[ImageGeneration]]:
+        """
+        Generate several images, running up to batch_parallelism API requests at once.
+
+        Args:
+            requests: (prompt, style) pairs; a None style uses the default style
+            width: Image width in pixels
+            height: Image height in pixels
+            save: Whether to save the images to disk
+
+        Returns:
+            ImageGeneration (or None if failed) per request, in request order
+        """
+        def create(request: Tuple[str, Optional[str]]) -> Optional[ImageGeneration]:
+            prompt, style = request
+            return self._create_generation(prompt, style, width, height)
+
+        workers = min(self.batch_parallelism, len(requests))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="illustrator") as executor:
+                generations = list(executor.map(create, requests))
+        else:
+            generations = [create(request) for request in requests]
+
+        # Saved and recorded here, in order, so workers never write files concurrently
+        for generation in generations:
+            if generation:
+                if save:
+                    self._persist(generation)
+                self._generations.append(generation)
+
+        return generations
+
+    def _persist(self, generation: ImageGeneration):
+        """Save a generation and drop its bytes from memory; ImageGeneration.reload() reads them back."""
+        if generation.save():
+            generation.image_data = None
+
+    def _create_generation(
+        self,
+        prompt: str,
+        style: Optional[str],
+        width: int,
+        height: int
+    ) -> Optional[ImageGeneration]:
+        """Generate an image without saving or recording it."""
         style = style or self.default_style
 
         # Enhance prompt with style preset
@@ -112,18 +259,14 @@ class Illustrator:
                 enhanced_prompt, style, width, height
             )
 
-        if generation and save:
-            generation.save()
-
-        if generation:
-            self._generations.append(generation)
-
         return generation
 
     def _enhance_prompt(self, prompt: str, style: str) -> str:
         """Enhance prompt with style keywords."""
-        style_keywords = self.style_presets.get(style, style)
-        return f"{prompt}, {style_keywords}, high quality, detailed"
+        suffix = self._style_suffixes.get(style)
+        if suffix is None:
+            suffix = f", {style}, high quality, detailed"
+        return prompt + suffix
 
     def _generate_with_api(
         self,
@@ -198,26 +341,12 @@ class Illustrator:
         # Truncate prompt for display
         display_prompt = prompt[:60] + "..." if len(prompt) > 60 else prompt
 
-        svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">
-  <defs>
-    <linearGradient id="bg" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#1a1a2e;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#16213e;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  <rect width="100%" height="100%" fill="url(#bg)"/>
-  <text x="50%" y="45%" text-anchor="middle" fill="#e94560" font-size="24" font-family="Arial">
-    [Image Placeholder]
-  </text>
-  <text x="50%" y="55%" text-anchor="middle" fill="#ffffff" font-size="14" font-family="Arial">
-    Style: {style}
-  </text>
-  <text x="50%" y="70%" text-anchor="middle" fill="#aaaaaa" font-size="12" font-family="Arial">
-    {display_prompt}
-  </text>
-</svg>'''
-        return svg
+        return _SVG_PLACEHOLDER.format_map({
+            'width': width,
+            'height': height,
+            'style': style,
+            'prompt': display_prompt
+        })
 
     def generate_scene_illustration(
         self,
@@ -239,14 +368,12 @@ class Illustrator:
         characters = story_segment.metadata.get('characters', [])
 
         # Build illustration prompt
-        if 'attack' in events or 'combat' in events:
-            scene_type = "intense battle scene"
-        elif 'interact' in events:
-            scene_type = "character interaction"
-        elif 'character_added' in events:
-            scene_type = "character introduction"
-        else:
-            scene_type = "narrative scene"
+        event_set = frozenset(events)
+        scene_type = _SCENE_LABELS[
+            (('attack' in event_set or 'combat' in event_set) << 2)
+            | (('interact' in event_set) << 1)
+            | ('character_added' in event_set)
+        ]
 
         character_desc = " featuring " + ", ".join(characters) if characters else ""
 
@@ -306,9 +433,9 @@ class Illustrator:
             True if successful
         """
         try:
-            html_content = self._generate_html_gallery()
-            with open(filepath, 'w') as f:
-                f.write(html_content)
+            data = self._generate_html_gallery().encode('utf-8')
+            with open(filepath, 'wb') as f:
+                f.write(data)
             logger.info(f"Gallery exported to {filepath}")
             return True
         except Exception as e:
@@ -317,32 +444,15 @@ class Illustrator:
 
     def _generate_html_gallery(self) -> str:
         """Generate HTML gallery content."""
-        images_html = ""
+        parts = [_GALLERY_HEAD]
+        append = parts.append
         for gen in self._generations:
             if gen.image_path:
-                images_html += f'''
+                append(f'''
                 <div class="image-card">
                     <img src="{gen.image_path}" alt="{gen.prompt[:50]}">
                     <p class="prompt">{gen.prompt}</p>
                     <p class="meta">{gen.style} | {gen.width}x{gen.height}</p>
-                </div>'''
-
-        return f'''<!DOCTYPE html>
-<html>
-<head>
-    <title>RIWA2 Image Gallery</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; background: #1a1a2e; color: #eee; padding: 20px; }}
-        h1 {{ text-align: center; color: #e94560; }}
-        .gallery {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(300px, 1fr)); gap: 20px; }}
-        .image-card {{ background: #16213e; border-radius: 8px; overflow: hidden; }}
-        .image-card img {{ width: 100%; height: 300px; object-fit: cover; }}
-        .prompt {{ padding: 10px; font-size: 14px; color: #aaa; }}
-        .meta {{ padding: 0 10px 10px; font-size: 12px; color: #666; }}
-    </style>
-</head>
-<body>
-    <h1>RIWA2 Illustration Gallery</h1>
-    <div class="gallery">{images_html}</div>
-</body>
-</html>'''
+                </div>''')
+        append(_GALLERY_TAIL)
+        return "".join(parts)
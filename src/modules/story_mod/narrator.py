@@ -1,12 +1,78 @@
-from typing import Dict, List, Any, Optional
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+import hashlib
+import json
 import os
+import re
+import threading
 from jinja2 import Environment, FileSystemLoader, BaseLoader
+from src.utils.compat import DATACLASS_SLOTS
+from src.utils.llm_client import FallbackResponse
 from src.utils.logger import logger
 
+try:
+    import orjson
 
-@dataclass
+    def _json_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _json_compact(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=repr).decode('utf-8')
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    def _json_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def _json_compact(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=repr)
+
+
+def _format_event_data(data: Any) -> str:
+    """Render event data for a prompt line as compact JSON, or repr() if it cannot be encoded."""
+    try:
+        return _json_compact(data)
+    except (TypeError, ValueError):
+        return repr(data)
+
+# Section headers separating per-window narratives in a batched LLM response
+_BATCH_HEADER = re.compile(r"^#{1,6}\s*Window\s+(\d+)\b[^\n]*$", re.MULTILINE | re.IGNORECASE)
+
+# Prompt used when no default_story template is found; compiled once per Narrator
+DEFAULT_PROMPT = """Based on the following simulation events, write an engaging narrative:
+
+{{ logs_text }}
+
+World State:
+{{ world_state }}
+
+Write in the {{ style }} style. Make it vivid and engaging."""
+
+# Narrative line per event type, used when no LLM client is configured
+_EVENT_FORMATTERS = {
+    'character_added': lambda d: f"A new figure emerged: {d.get('name', 'Unknown')}.",
+    'character_removed': lambda d: f"{d.get('name', 'Someone')} departed from the world.",
+    'move': lambda d: f"{d.get('actor', 'Someone')} moved to {d.get('to', 'somewhere')}.",
+    'attack': lambda d: f"{d.get('actor', 'Someone')} attacked {d.get('target', 'another')} for {d.get('damage', 0)} damage!",
+    'interact': lambda d: f"{d.get('actor', 'Someone')} {d.get('interaction', 'interacted')} with {d.get('target', 'another')}.",
+    'rest': lambda d: f"{d.get('actor', 'Someone')} took a moment to rest and recover.",
+    'custom_injection': lambda d: "Reality shifted as something new was injected into the world."
+}
+
+
+# Shared stand-in for a log without data; never mutated
+_EMPTY: Dict[str, Any] = {}
+
+_MISSING = object()
+
+
+def _default_formatter(data: Dict[str, Any]) -> str:
+    return f"Something happened: {data}"
+
+
+@dataclass(**DATACLASS_SLOTS)
 class StorySegment:
     """Represents a segment of generated story."""
     tick_start: int
@@ -37,13 +103,39 @@ class Narrator:
         self,
         template_dir: str = "src/modules/story_mod/prompt_templates",
         llm_client: Optional[Any] = None,
-        style: str = "default"
+        style: str = "default",
+        batch_parallelism: int = 4,
+        llm_cache_size: int = 0,
+        llm_cache_path: Optional[str] = None
     ):
         self.template_dir = template_dir
         self.llm_client = llm_client
         self.style = style
+        self.batch_parallelism = batch_parallelism  # Concurrent LLM requests in generate_stories_for()
+        # Segments ordered by tick_start. For bisecting, _segment_starts mirrors their
+        # starts and _segment_max_ends holds the running maximum of their tick_end.
         self._story_segments: List[StorySegment] = []
-        self._pending_logs: List[Dict[str, Any]] = []
+        self._segment_starts: List[int] = []
+        self._segment_max_ends: List[int] = []
+        # Guards the three segment lists; batches from worker threads store segments concurrently
+        self._segments_lock = threading.Lock()
+        # Pending logs bucketed by tick, so a story window only touches its own ticks
+        self._pending_logs: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        # Guards _pending_logs; story batches may run on a worker thread while logs arrive
+        self._logs_lock = threading.Lock()
+        # (world, tick_count, serialized) for the last world serialized; one tuple so
+        # concurrent batches never pair a key with another world's result
+        self._ws_cache: Optional[Tuple[Any, Any, Dict[str, Any]]] = None
+
+        # LLM responses by hash of (provider, model, style, prompt), least recently used first.
+        # Off by default (0): LLMClient already caches responses in memory. With llm_cache_path
+        # set, responses are appended there as JSON lines and reused across runs.
+        self.llm_cache_size = llm_cache_size
+        self.llm_cache_path = llm_cache_path
+        self._llm_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._llm_cache_lock = threading.Lock()
+        if llm_cache_path and llm_cache_size:
+            self._load_llm_cache()
 
         # Setup Jinja2 environment
         if os.path.exists(template_dir):
@@ -54,6 +146,8 @@ class Narrator:
 
         # Load default templates if they exist
         self._load_templates()
+        self._default_story_tpl = self.templates.get('default_story')
+        self._default_prompt_template = self.jinja_env.from_string(DEFAULT_PROMPT)
 
     def _load_templates(self):
         """Load prompt templates."""
@@ -81,11 +175,15 @@ class Narrator:
         Args:
             log_entry: Dictionary containing log data
         """
-        self._pending_logs.append(log_entry)
+        with self._logs_lock:
+            self._pending_logs[log_entry.get('tick', 0)].append(log_entry)
 
     def add_logs(self, log_entries: List[Dict[str, Any]]):
         """Add multiple log entries."""
-        self._pending_logs.extend(log_entries)
+        with self._logs_lock:
+            pending = self._pending_logs
+            for log_entry in log_entries:
+                pending[log_entry.get('tick', 0)].append(log_entry)
 
     def generate_story(
         self,
@@ -106,54 +204,281 @@ class Narrator:
         Returns:
             Generated story segment
         """
-        style = style or self.style
+        return self.generate_stories_batch(world_state, [(tick_start, tick_end)], style)[0]
 
-        # Filter logs for the specified tick range
-        relevant_logs = [
-            log for log in self._pending_logs
-            if tick_start <= log.get('tick', 0) <= tick_end
-        ]
+    def generate_stories_batch(
+        self,
+        world_state: Any,
+        windows: List[Tuple[int, int]],
+        style: Optional[str] = None
+    ) -> List[StorySegment]:
+        """
+        Generate story segments for several tick windows with a single LLM request.
+
+        The world state is sent once for all windows instead of once per window.
+        If the response cannot be split back into per-window narratives, each
+        window falls back to its own request.
+
+        Args:
+            world_state: Current world state
+            windows: (tick_start, tick_end) pairs in chronological order
+            style: Optional writing style override
 
-        if not relevant_logs:
-            return StorySegment(
+        Returns:
+            One story segment per window, in the order given
+        """
+        batch = self._take_window_logs(windows)
+        segments = self._narrate_batch(world_state, batch, style or self.style)
+        self._store_segments(batch, segments)
+        return segments
+
+    def generate_stories_for(
+        self,
+        requests: List[Tuple[Any, int, int, Optional[str]]]
+    ) -> List[StorySegment]:
+        """
+        Generate story segments for windows that may differ in world state and style.
+
+        Requests sharing a world state and style are narrated together with one
+        LLM request, as in generate_stories_batch(); up to batch_parallelism of
+        these groups are sent to the LLM at once.
+
+        Args:
+            requests: (world_state, tick_start, tick_end, style) tuples; a None
+                style uses the narrator's default style
+
+        Returns:
+            One story segment per request, in the order given
+        """
+        batch = self._take_window_logs([(start, end) for _, start, end, _ in requests])
+
+        # Group request indices by (world state, style), keeping request order within a group
+        groups: Dict[Tuple[int, str], List[int]] = {}
+        for index, (world_state, _, _, style) in enumerate(requests):
+            groups.setdefault((id(world_state), style or self.style), []).append(index)
+
+        def narrate(key_indices: Tuple[Tuple[int, str], List[int]]) -> List[StorySegment]:
+            (_, style), indices = key_indices
+            return self._narrate_batch(requests[indices[0]][0], [batch[i] for i in indices], style)
+
+        workers = min(self.batch_parallelism, len(groups)) if self.llm_client else 1
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="narrator") as executor:
+                results = list(executor.map(narrate, groups.items()))
+        else:
+            results = [narrate(item) for item in groups.items()]
+
+        segments: List[Optional[StorySegment]] = [None] * len(requests)
+        for indices, group_segments in zip(groups.values(), results):
+            for index, segment in zip(indices, group_segments):
+                segments[index] = segment
+        self._store_segments(batch, segments)
+        return segments
+
+    def _take_window_logs(
+        self,
+        windows: List[Tuple[int, int]]
+    ) -> List[Tuple[int, int, List[Dict[str, Any]]]]:
+        """
+        Collect the pending logs of each window and drop every pending log up to
+        the last window's end.
+
+        Returns:
+            (tick_start, tick_end, logs) per window, in the order given
+        """
+        with self._logs_lock:
+            batch = [
+                (tick_start, tick_end, self._logs_in_window(tick_start, tick_end))
+                for tick_start, tick_end in windows
+            ]
+            if windows:
+                last_tick = max(tick_end for _, tick_end in windows)
+                pending = self._pending_logs
+                for tick in [tick for tick in pending if tick <= last_tick]:
+                    del pending[tick]
+        return batch
+
+    def _narrate_batch(
+        self,
+        world_state: Any,
+        batch: List[Tuple[int, int, List[Dict[str, Any]]]],
+        style: str
+    ) -> List[StorySegment]:
+        """Build one segment per window; windows with logs share one LLM request when possible."""
+        active = [logs for _, _, logs in batch if logs]
+
+        contents: List[Optional[str]] = [None] * len(active)
+        if self.llm_client and len(active) > 1:
+            contents = self._generate_batch_with_llm(world_state, active, style)
+
+        segments = []
+        index = 0
+        for tick_start, tick_end, relevant_logs in batch:
+            if not relevant_logs:
+                segments.append(StorySegment(
+                    tick_start=tick_start,
+                    tick_end=tick_end,
+                    content="",
+                    summary="No events occurred."
+                ))
+                continue
+
+            content = contents[index]
+            index += 1
+            if content is None:
+                # Build context for LLM
+                context = self._build_context(world_state, relevant_logs)
+
+                # Generate story using LLM or template
+                if self.llm_client:
+                    content = self._generate_with_llm(context, style)
+                else:
+                    content = self._generate_with_template(context, style)
+
+            # Create summary
+            summary = self._generate_summary(relevant_logs)
+
+            segments.append(StorySegment(
                 tick_start=tick_start,
                 tick_end=tick_end,
-                content="",
-                summary="No events occurred."
-            )
+                content=content,
+                summary=summary,
+                metadata={
+                    'log_count': len(relevant_logs),
+                    'style': style,
+                    'events': [log.get('event_type') for log in relevant_logs]
+                }
+            ))
+            logger.info(f"Generated story segment for ticks {tick_start}-{tick_end}")
 
-        # Build context for LLM
-        context = self._build_context(world_state, relevant_logs)
+        return segments
 
-        # Generate story using LLM or template
-        if self.llm_client:
-            content = self._generate_with_llm(context, style)
+    def _store_segments(
+        self,
+        batch: List[Tuple[int, int, List[Dict[str, Any]]]],
+        segments: List[StorySegment]
+    ):
+        """Keep the segments of windows that had events."""
+        with self._segments_lock:
+            for (_, _, logs), segment in zip(batch, segments):
+                if logs:
+                    self._insert_segment(segment)
+
+    def _logs_in_window(self, tick_start: int, tick_end: int) -> List[Dict[str, Any]]:
+        """Collect pending logs with tick_start <= tick <= tick_end; caller holds _logs_lock."""
+        pending = self._pending_logs
+        if tick_end - tick_start < len(pending):
+            ticks = range(tick_start, tick_end + 1)
         else:
-            content = self._generate_with_template(context, style)
-
-        # Create summary
-        summary = self._generate_summary(relevant_logs)
-
-        segment = StorySegment(
-            tick_start=tick_start,
-            tick_end=tick_end,
-            content=content,
-            summary=summary,
-            metadata={
-                'log_count': len(relevant_logs),
-                'style': style,
-                'events': [log.get('event_type') for log in relevant_logs]
-            }
-        )
+            # Window wider than the number of buckets: walk the buckets instead
+            ticks = sorted(tick for tick in pending if tick_start <= tick <= tick_end)
+        return [log for tick in ticks if tick in pending for log in pending[tick]]
+
+    def _insert_segment(self, segment: StorySegment):
+        """Store a segment ordered by tick_start (stable for equal starts); caller holds _segments_lock."""
+        index = bisect_right(self._segment_starts, segment.tick_start)
+        self._segment_starts.insert(index, segment.tick_start)
+        self._story_segments.insert(index, segment)
+
+        max_ends = self._segment_max_ends
+        running = segment.tick_end
+        if index and max_ends[index - 1] > running:
+            running = max_ends[index - 1]
+        max_ends.insert(index, running)
+        # Later running maxima only change until one already covers this segment
+        for i in range(index + 1, len(max_ends)):
+            if max_ends[i] >= running:
+                break
+            max_ends[i] = running
+
+    def _generate_batch_with_llm(
+        self,
+        world_state: Any,
+        log_windows: List[List[Dict[str, Any]]],
+        style: str
+    ) -> List[Optional[str]]:
+        """
+        Narrate several log windows in one LLM request.
 
-        self._story_segments.append(segment)
-        self._pending_logs = [
-            log for log in self._pending_logs
-            if log.get('tick', 0) > tick_end
-        ]
+        Returns:
+            Narrative per window, or all None if the response could not be split
+        """
+        missing: List[Optional[str]] = [None] * len(log_windows)
+        prompt = self._build_batch_prompt(world_state, log_windows, style)
+
+        try:
+            response = self._call_llm(prompt, style)
+        except Exception as e:
+            logger.error(f"LLM batch generation failed: {e}")
+            return missing
+
+        # Response is expected as "### Window 1 ... ### Window N" sections
+        parts = _BATCH_HEADER.split(response)
+        sections = {int(number): text.strip() for number, text in zip(parts[1::2], parts[2::2])}
+        if sorted(sections) != list(range(1, len(log_windows) + 1)) or not all(sections.values()):
+            logger.warning("LLM batch response did not match the requested windows; narrating individually")
+            return missing
+
+        return [sections[i] for i in range(1, len(log_windows) + 1)]
+
+    def _build_batch_prompt(
+        self,
+        world_state: Any,
+        log_windows: List[List[Dict[str, Any]]],
+        style: str
+    ) -> str:
+        """Build one prompt covering several log windows that share the world state."""
+        window_texts = []
+        for number, logs in enumerate(log_windows, 1):
+            window_texts.append(f"### Window {number}\n{self._format_logs_for_prompt(logs)}")
+
+        windows_text = "\n\n".join(window_texts)
+
+        return f"""Based on the following simulation events, write an engaging narrative for each window:
+
+{windows_text}
+
+World State:
+{self._serialize_world_state(world_state)}
+
+Write in the {style} style. Make it vivid and engaging.
+Start each narrative with its own header line exactly as given (### Window 1, ### Window 2, ...) and write nothing before the first header."""
+
+    def _format_logs_for_prompt(self, logs: List[Dict[str, Any]]) -> str:
+        """
+        Render logs as prompt lines, collapsing runs of identical events.
+
+        Consecutive events with the same type and data become one line carrying
+        the tick range and a repeat count, e.g. "- [4-9] rest: {...} (x6)". Event
+        data is written as compact JSON, which is cheaper to build than repr().
+        """
+        lines = []
+        run_key = None
+        run_start = run_end = None
+        run_length = 0
 
-        logger.info(f"Generated story segment for ticks {tick_start}-{tick_end}")
-        return segment
+        def close_run():
+            ticks = run_start if run_start == run_end else f"{run_start}-{run_end}"
+            repeat = f" (x{run_length})" if run_length > 1 else ""
+            lines.append(f"- [{ticks}] {run_key[0]}: {_format_event_data(run_key[1])}{repeat}")
+
+        for log in logs:
+            get = log.get
+            key = (get('event_type'), get('data', _EMPTY))
+            tick = get('tick', '?')
+            if run_length and key == run_key:
+                run_end = tick
+                run_length += 1
+                continue
+            if run_length:
+                close_run()
+            run_key, run_start, run_end, run_length = key, tick, tick, 1
+        if run_length:
+            close_run()
+
+        if len(lines) < len(logs):
+            logger.debug("Prompt events compressed: %s -> %s lines", len(logs), len(lines))
+        return "\n".join(lines)
 
     def _build_context(self, world_state: Any, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Build context dictionary for story generation."""
@@ -165,14 +490,18 @@ class Narrator:
 
         # Extract characters involved
         characters = set()
+        add = characters.add
         for log in logs:
-            data = log.get('data', {})
-            if 'character' in data:
-                characters.add(data['character'])
-            if 'actor' in data:
-                characters.add(data['actor'])
-            if 'target' in data:
-                characters.add(data['target'])
+            data = log.get('data') or _EMPTY
+            character = data.get('character')
+            if character:
+                add(character)
+            actor = data.get('actor')
+            if actor:
+                add(actor)
+            target = data.get('target')
+            if target:
+                add(target)
 
         context['characters'] = list(characters)
 
@@ -180,14 +509,37 @@ class Narrator:
 
     def _serialize_world_state(self, world_state: Any) -> Dict[str, Any]:
         """Serialize world state for LLM context."""
-        if hasattr(world_state, 'to_dict'):
-            return world_state.to_dict()
+        if isinstance(world_state, dict):
+            # Already serialized, e.g. a get_state() snapshot taken before narrating off-thread
+            return world_state
+
+        # Batch prompts and per-window contexts for the same tick share one serialization;
+        # changes between ticks (e.g. injections) must call invalidate_world_cache()
+        tick = getattr(world_state, 'tick_count', _MISSING)
+        cached = self._ws_cache
+        if tick is not _MISSING and cached is not None and cached[0] is world_state and cached[1] == tick:
+            return cached[2]
+
+        result = self._serialize_world_object(world_state)
+        if tick is not _MISSING:
+            self._ws_cache = (world_state, tick, result)
+        return result
+
+    def invalidate_world_cache(self):
+        """Drop the cached world serialization; call when the world changes without a tick."""
+        self._ws_cache = None
+
+    def _serialize_world_object(self, world_state: Any) -> Dict[str, Any]:
+        """Serialize a world object via its to_dict() or its entity attributes."""
+        to_dict = getattr(world_state, 'to_dict', None)
+        if to_dict is not None:
+            return to_dict()
 
         # Basic serialization
         result = {}
-        for attr in ['tick_count', 'locations', 'characters', 'items']:
-            if hasattr(world_state, attr):
-                value = getattr(world_state, attr)
+        for attr in ('tick_count', 'locations', 'characters', 'items'):
+            value = getattr(world_state, attr, _MISSING)
+            if value is not _MISSING:
                 if isinstance(value, dict):
                     result[attr] = {k: v.to_dict() if hasattr(v, 'to_dict') else v
                                    for k, v in value.items()}
@@ -202,7 +554,7 @@ class Narrator:
     def _generate_with_llm(self, context: Dict[str, Any], style: str) -> str:
         """Generate story using LLM."""
         # Get appropriate template
-        template = self.templates.get('default_story')
+        template = self._default_story_tpl
 
         if template:
             prompt = template.render(**context)
@@ -211,73 +563,96 @@ class Narrator:
 
         # Call LLM
         try:
-            response = self.llm_client.generate(
-                prompt=prompt,
-                style=style
-            )
-            return response
+            return self._call_llm(prompt, style)
         except Exception as e:
             logger.error(f"LLM generation failed: {e}")
             return self._generate_with_template(context, style)
 
+    def _call_llm(self, prompt: str, style: str) -> str:
+        """Send a prompt to the LLM client, answering repeated prompts from the response cache."""
+        if not self.llm_cache_size:
+            return self.llm_client.generate(prompt=prompt, style=style)
+
+        # Responses are only reusable for the same provider and model, including persisted ones
+        provider = getattr(self.llm_client, 'provider', self.llm_client)
+        key_text = f"{type(provider).__name__}\0{getattr(provider, 'model', None)}\0{style}\0{prompt}"
+        key = hashlib.blake2b(key_text.encode('utf-8'), digest_size=16).hexdigest()
+        cache = self._llm_cache
+        with self._llm_cache_lock:
+            response = cache.get(key)
+            if response is not None:
+                cache.move_to_end(key)
+                return response
+
+        response = self.llm_client.generate(prompt=prompt, style=style)
+        # Fallback placeholders are only valid for this call; caching them would outlive the outage
+        if not isinstance(response, str) or isinstance(response, FallbackResponse):
+            return response
+
+        with self._llm_cache_lock:
+            self._cache_llm_response(key, response)
+            if self.llm_cache_path:
+                try:
+                    with open(self.llm_cache_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps({'key': key, 'response': response}, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    logger.warning(f"Failed to persist LLM response cache: {e}")
+        return response
+
+    def _cache_llm_response(self, key: str, response: str):
+        """Remember an LLM response, evicting the least recently used entries; caller holds the lock."""
+        cache = self._llm_cache
+        cache[key] = response
+        cache.move_to_end(key)
+        while len(cache) > self.llm_cache_size:
+            cache.popitem(last=False)
+
+    def _load_llm_cache(self):
+        """Load responses persisted by earlier runs; later lines win."""
+        try:
+            with open(self.llm_cache_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._cache_llm_response(entry['key'], entry['response'])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Skip lines torn by an interrupted write
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Failed to load LLM response cache: {e}")
+
     def _generate_with_template(self, context: Dict[str, Any], style: str) -> str:
         """Generate story using template-based approach."""
         events = context.get('logs', [])
 
-        paragraphs = []
-        for event in events:
-            event_type = event.get('event_type', 'unknown')
-            data = event.get('data', {})
-
-            paragraph = self._format_event(event_type, data, style)
-            if paragraph:
-                paragraphs.append(paragraph)
+        format_event = self._format_event
+        paragraphs = [
+            paragraph for event in events
+            if (paragraph := format_event(event.get('event_type', 'unknown'), event.get('data', _EMPTY), style))
+        ]
 
         return "\n\n".join(paragraphs) if paragraphs else "Nothing notable happened."
 
     def _format_event(self, event_type: str, data: Dict[str, Any], style: str) -> str:
         """Format a single event into narrative text."""
-        formatters = {
-            'character_added': lambda d: f"A new figure emerged: {d.get('name', 'Unknown')}.",
-            'character_removed': lambda d: f"{d.get('name', 'Someone')} departed from the world.",
-            'move': lambda d: f"{d.get('actor', 'Someone')} moved to {d.get('to', 'somewhere')}.",
-            'attack': lambda d: f"{d.get('actor', 'Someone')} attacked {d.get('target', 'another')} for {d.get('damage', 0)} damage!",
-            'interact': lambda d: f"{d.get('actor', 'Someone')} {d.get('interaction', 'interacted')} with {d.get('target', 'another')}.",
-            'rest': lambda d: f"{d.get('actor', 'Someone')} took a moment to rest and recover.",
-            'custom_injection': lambda d: f"Reality shifted as something new was injected into the world."
-        }
-
-        formatter = formatters.get(event_type, lambda d: f"Something happened: {d}")
-        return formatter(data)
+        return _EVENT_FORMATTERS.get(event_type, _default_formatter)(data)
 
     def _generate_summary(self, logs: List[Dict[str, Any]]) -> str:
         """Generate a brief summary of events."""
         if not logs:
             return "No events."
 
-        event_counts = {}
-        for log in logs:
-            event_type = log.get('event_type', 'unknown')
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
-
-        parts = [f"{count}x {event_type}" for event_type, count in event_counts.items()]
-        return ", ".join(parts)
+        event_counts = Counter(log.get('event_type', 'unknown') for log in logs)
+        return ", ".join(f"{count}x {event_type}" for event_type, count in event_counts.items())
 
     def _build_default_prompt(self, context: Dict[str, Any]) -> str:
         """Build a default prompt for LLM."""
-        logs_text = "\n".join([
-            f"- [{log.get('tick', '?')}] {log.get('event_type')}: {log.get('data', {})}"
-            for log in context.get('logs', [])
-        ])
-
-        return f"""Based on the following simulation events, write an engaging narrative:
-
-{logs_text}
-
-World State:
-{context.get('world_state', {})}
-
-Write in the {context.get('style', 'default')} style. Make it vivid and engaging."""
+        return self._default_prompt_template.render(
+            logs_text=self._format_logs_for_prompt(context.get('logs', [])),
+            world_state=context.get('world_state', {}),
+            style=context.get('style', 'default')
+        )
 
     def get_story_segments(
         self,
@@ -294,18 +669,20 @@ Write in the {context.get('style', 'default')} style. Make it vivid and engaging
         Returns:
             List of story segments
         """
-        segments = self._story_segments.copy()
+        with self._segments_lock:
+            segments = self._story_segments
+            # Segments past hi start after tick_end; those before first all end before tick_start
+            hi = len(segments) if tick_end is None else bisect_right(self._segment_starts, tick_end)
+            if tick_start is None:
+                return segments[:hi]
 
-        if tick_start is not None:
-            segments = [s for s in segments if s.tick_end >= tick_start]
-        if tick_end is not None:
-            segments = [s for s in segments if s.tick_start <= tick_end]
-
-        return segments
+            first = bisect_left(self._segment_max_ends, tick_start, 0, hi)
+            return [s for s in segments[first:hi] if s.tick_end >= tick_start]
 
     def get_full_story(self) -> str:
         """Get the complete story as a single string."""
-        segments = sorted(self._story_segments, key=lambda s: s.tick_start)
+        with self._segments_lock:
+            segments = list(self._story_segments)
         return "\n\n---\n\n".join(s.content for s in segments)
 
     def export_story(self, filepath: str, format: str = "text") -> bool:
@@ -321,10 +698,11 @@ Write in the {context.get('style', 'default')} style. Make it vivid and engaging
         """
         try:
             if format == "json":
-                import json
-                data = [s.to_dict() for s in self._story_segments]
-                with open(filepath, 'w') as f:
-                    json.dump(data, f, indent=2)
+                with self._segments_lock:
+                    segments = list(self._story_segments)
+                payload = _json_pretty([s.to_dict() for s in segments])
+                with open(filepath, 'wb') as f:
+                    f.write(payload)
             else:
                 with open(filepath, 'w') as f:
                     f.write(self.get_full_story())
@@ -13,7 +13,8 @@ from src.modules.world_mod.actions import (
     InteractAction,
     UseItemAction,
     AttackAction,
-    RestAction
+    RestAction,
+    ACTION_FNS
 )
 
 __all__ = [
@@ -27,5 +28,6 @@ __all__ = [
     "InteractAction",
     "UseItemAction",
     "AttackAction",
-    "RestAction"
+    "RestAction",
+    "ACTION_FNS"
 ]
@@ -1,12 +1,13 @@
-from typing import Dict, List, Any, Optional, TYPE_CHECKING
+from typing import Callable, Dict, List, Any, Optional, TYPE_CHECKING
 from dataclasses import dataclass, field
+from src.utils.compat import DATACLASS_SLOTS
 from src.utils.logger import logger
 
 if TYPE_CHECKING:
     from src.core.entities import Character, Item, Location
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ActionResult:
     """Result of an action execution."""
     success: bool
@@ -15,12 +16,235 @@ class ActionResult:
     side_effects: List[str] = field(default_factory=list)
 
 
+# Action functions
+#
+# Each action is a plain function taking the world state first, followed by the
+# same arguments as its Action class. Hot paths call them through ACTION_FNS (or
+# ActionRegistry.execute) without allocating an Action object per action.
+
+# Relationship change per interaction type
+_AFFINITY = {
+    "talk": 5,
+    "trade": 10,
+    "help": 15,
+    "attack": -20,
+    "ignore": -5
+}
+
+
+def can_move(actor: 'Character') -> bool:
+    """Check whether a character has the energy to move."""
+    return actor.energy >= 5
+
+
+def can_interact(actor: 'Character', target: 'Character') -> bool:
+    """Check whether a character can interact with another."""
+    return actor.energy >= 10 and actor.location == target.location
+
+
+def can_use_item(actor: 'Character', item: 'Item') -> bool:
+    """Check whether a character holds an item and can afford to use it."""
+    return item.id in actor.inventory and actor.energy >= item.attributes.get('energy_cost', 0)
+
+
+def can_attack(actor: 'Character', target: 'Character') -> bool:
+    """Check whether a character can attack another."""
+    return actor.energy >= 20 and actor.location == target.location
+
+
+def execute_move(world_state: Any, actor: 'Character', destination: str) -> ActionResult:
+    """Move a character to a different location."""
+    if not can_move(actor):
+        return ActionResult(
+            success=False,
+            message="Not enough energy to move"
+        )
+
+    # Find location
+    locations = getattr(world_state, 'locations', {})
+    if destination not in locations:
+        return ActionResult(
+            success=False,
+            message=f"Location '{destination}' not found"
+        )
+
+    # Update character location
+    old_location = actor.location
+    actor.location = destination
+
+    # Update location entities
+    if old_location and old_location in locations:
+        locations[old_location].remove_character(actor.id)
+
+    locations[destination].add_character(actor.id)
+    actor.energy -= 5
+
+    return ActionResult(
+        success=True,
+        message=f"{actor.name} moved to {destination}",
+        data={'from': old_location, 'to': destination}
+    )
+
+
+def execute_interact(
+    world_state: Any,
+    actor: 'Character',
+    target: 'Character',
+    interaction_type: str = "talk"
+) -> ActionResult:
+    """Interact with another character, changing the actor's affinity towards them."""
+    if not can_interact(actor, target):
+        return ActionResult(
+            success=False,
+            message="Cannot interact: requirements not met"
+        )
+
+    # Update relationship based on interaction
+    affinity_change = _AFFINITY.get(interaction_type, 0)
+
+    current_rel = actor.get_relationship(target.id)
+    actor.set_relationship(target.id, current_rel + affinity_change)
+
+    actor.energy -= 10
+
+    return ActionResult(
+        success=True,
+        message=f"{actor.name} {interaction_type}s with {target.name}",
+        data={
+            'interaction': interaction_type,
+            'affinity_change': affinity_change
+        }
+    )
+
+
+def execute_use_item(
+    world_state: Any,
+    actor: 'Character',
+    item: 'Item',
+    target: Optional[Any] = None
+) -> ActionResult:
+    """Use an item from the actor's inventory."""
+    if not can_use_item(actor, item):
+        return ActionResult(
+            success=False,
+            message="Cannot use item: requirements not met"
+        )
+
+    energy_cost = item.attributes.get('energy_cost', 0)
+    actor.energy -= energy_cost
+
+    # Apply item effects
+    effects = item.attributes.get('effects', {})
+    for effect, value in effects.items():
+        if effect == 'heal':
+            actor.heal(value)
+        elif effect == 'damage':
+            actor.take_damage(value)
+        elif effect == 'energy':
+            actor.energy = min(100, actor.energy + value)
+
+    # Handle consumable
+    if item.item_type == "consumable":
+        actor.remove_item(item.id)
+
+    return ActionResult(
+        success=True,
+        message=f"{actor.name} used {item.name}",
+        data={'item': item.name, 'effects': list(effects.keys())}
+    )
+
+
+def equipped_weapon(actor: 'Character', items: Dict[str, 'Item']) -> Optional['Item']:
+    """
+    Return a character's equipped weapon, or None.
+
+    The weapon id is cached on the character; the inventory is only scanned when
+    the cached weapon was dropped, unequipped or removed from the world.
+    """
+    inventory = actor.inventory
+    weapon_id = getattr(actor, 'equipped_weapon_id', None)
+    if weapon_id is not None and weapon_id in inventory:
+        item = items.get(weapon_id)
+        if item is not None and item.item_type == "weapon" and item.attributes.get('equipped', False):
+            return item
+
+    weapon = None
+    for item_id in inventory:
+        item = items.get(item_id)
+        if item is not None and item.attributes.get('equipped', False) and item.item_type == "weapon":
+            weapon = item
+    actor.equipped_weapon_id = weapon.id if weapon is not None else None
+    return weapon
+
+
+def execute_attack(world_state: Any, actor: 'Character', target: 'Character') -> ActionResult:
+    """Attack another character at the same location."""
+    if not can_attack(actor, target):
+        return ActionResult(
+            success=False,
+            message="Cannot attack: requirements not met"
+        )
+
+    # Calculate damage
+    base_damage = actor.attributes.get('attack', 10)
+    weapon = equipped_weapon(actor, getattr(world_state, 'items', {}))
+    weapon_bonus = weapon.attributes.get('damage', 0) if weapon is not None else 0
+
+    total_damage = base_damage + weapon_bonus
+    actual_damage = target.take_damage(total_damage)
+    actor.energy -= 20
+
+    # Gain experience for dealing damage
+    actor.gain_experience(actual_damage)
+
+    # Update relationship
+    current_rel = actor.get_relationship(target.id)
+    actor.set_relationship(target.id, current_rel - 20)
+
+    return ActionResult(
+        success=True,
+        message=f"{actor.name} attacks {target.name} for {actual_damage} damage",
+        data={
+            'damage': actual_damage,
+            'target_health': target.health
+        },
+        side_effects=['combat_log_entry']
+    )
+
+
+def execute_rest(world_state: Any, actor: 'Character') -> ActionResult:
+    """Rest to recover health and energy."""
+    # Recover health and energy
+    health_recover = actor.attributes.get('health_regen', 5)
+    energy_recover = actor.attributes.get('energy_regen', 10)
+
+    actual_heal = actor.heal(health_recover)
+    actor.energy = min(100, actor.energy + energy_recover)
+
+    return ActionResult(
+        success=True,
+        message=f"{actor.name} rests and recovers",
+        data={
+            'health_recovered': actual_heal,
+            'energy_recovered': energy_recover
+        }
+    )
+
+
+# Action name -> function; filled by ActionRegistry.register
+ACTION_FNS: Dict[str, Callable[..., ActionResult]] = {}
+
+
+# Action classes: object wrappers over the action functions
+
 class Action:
     """Base class for all actions in the simulation."""
 
     name: str = "base_action"
     description: str = "Base action"
 
+    __slots__ = ('actor', 'target')
+
     def __init__(self, actor: 'Character', target: Optional[Any] = None):
         self.actor = actor
         self.target = target
@@ -44,46 +268,17 @@ class MoveAction(Action):
     name = "move"
     description = "Move to a different location"
 
+    __slots__ = ('destination',)
+
     def __init__(self, actor: 'Character', destination: str):
         super().__init__(actor)
         self.destination = destination
 
     def check_requirements(self) -> bool:
-        if self.actor.energy < 5:
-            return False
-        return True
+        return can_move(self.actor)
 
     def execute(self, world_state: Any) -> ActionResult:
-        if not self.check_requirements():
-            return ActionResult(
-                success=False,
-                message="Not enough energy to move"
-            )
-
-        # Find location
-        locations = getattr(world_state, 'locations', {})
-        if self.destination not in locations:
-            return ActionResult(
-                success=False,
-                message=f"Location '{self.destination}' not found"
-            )
-
-        # Update character location
-        old_location = self.actor.location
-        self.actor.location = self.destination
-
-        # Update location entities
-        if old_location and old_location in locations:
-            locations[old_location].remove_character(self.actor.id)
-
-        locations[self.destination].add_character(self.actor.id)
-        self.actor.energy -= 5
-
-        return ActionResult(
-            success=True,
-            message=f"{self.actor.name} moved to {self.destination}",
-            data={'from': old_location, 'to': self.destination}
-        )
+        return execute_move(world_state, self.actor, self.destination)
 
 
 class InteractAction(Action):
@@ -92,46 +287,17 @@ class InteractAction(Action):
     name = "interact"
     description = "Interact with another character"
 
+    __slots__ = ('interaction_type',)
+
     def __init__(self, actor: 'Character', target: 'Character', interaction_type: str = "talk"):
         super().__init__(actor, target)
         self.interaction_type = interaction_type
 
     def check_requirements(self) -> bool:
-        if self.actor.energy < 10:
-            return False
-        if self.actor.location != self.target.location:
-            return False
-        return True
+        return can_interact(self.actor, self.target)
 
     def execute(self, world_state: Any) -> ActionResult:
-        if not self.check_requirements():
-            return ActionResult(
-                success=False,
-                message="Cannot interact: requirements not met"
-            )
-
-        # Update relationship based on interaction
-        affinity_change = {
-            "talk": 5,
-            "trade": 10,
-            "help": 15,
-            "attack": -20,
-            "ignore": -5
-        }.get(self.interaction_type, 0)
-
-        current_rel = self.actor.get_relationship(self.target.id)
-        self.actor.set_relationship(self.target.id, current_rel + affinity_change)
-
-        self.actor.energy -= 10
-
-        return ActionResult(
-            success=True,
-            message=f"{self.actor.name} {self.interaction_type}s with {self.target.name}",
-            data={
-                'interaction': self.interaction_type,
-                'affinity_change': affinity_change
-            }
-        )
+        return execute_interact(world_state, self.actor, self.target, self.interaction_type)
 
 
 class UseItemAction(Action):
@@ -140,46 +306,17 @@ class UseItemAction(Action):
     name = "use_item"
     description = "Use an item from inventory"
 
+    __slots__ = ('item',)
+
     def __init__(self, actor: 'Character', item: 'Item', target: Optional[Any] = None):
         super().__init__(actor, target)
         self.item = item
 
     def check_requirements(self) -> bool:
-        if self.item.id not in self.actor.inventory:
-            return False
-        if self.actor.energy < self.item.attributes.get('energy_cost', 0):
-            return False
-        return True
+        return can_use_item(self.actor, self.item)
 
     def execute(self, world_state: Any) -> ActionResult:
-        if not self.check_requirements():
-            return ActionResult(
-                success=False,
-                message="Cannot use item: requirements not met"
-            )
-
-        energy_cost = self.item.attributes.get('energy_cost', 0)
-        self.actor.energy -= energy_cost
-
-        # Apply item effects
-        effects = self.item.attributes.get('effects', {})
-        for effect, value in effects.items():
-            if effect == 'heal':
-                self.actor.heal(value)
-            elif effect == 'damage':
-                self.actor.take_damage(value)
-            elif effect == 'energy':
-                self.actor.energy = min(100, self.actor.energy + value)
-
-        # Handle consumable
-        if self.item.item_type == "consumable":
-            self.actor.remove_item(self.item.id)
-
-        return ActionResult(
-            success=True,
-            message=f"{self.actor.name} used {self.item.name}",
-            data={'item': self.item.name, 'effects': list(effects.keys())}
-        )
+        return execute_use_item(world_state, self.actor, self.item, self.target)
 
 
 class AttackAction(Action):
@@ -188,55 +325,16 @@ class AttackAction(Action):
     name = "attack"
     description = "Attack another character"
 
+    __slots__ = ()
+
     def __init__(self, actor: 'Character', target: 'Character'):
         super().__init__(actor, target)
 
     def check_requirements(self) -> bool:
-        if self.actor.energy < 20:
-            return False
-        if self.actor.location != self.target.location:
-            return False
-        return True
+        return can_attack(self.actor, self.target)
 
     def execute(self, world_state: Any) -> ActionResult:
-        if not self.check_requirements():
-            return ActionResult(
-                success=False,
-                message="Cannot attack: requirements not met"
-            )
-
-        # Calculate damage
-        base_damage = self.actor.attributes.get('attack', 10)
-        weapon_bonus = 0
-
-        # Check for equipped weapon
-        for item_id in self.actor.inventory:
-            items = getattr(world_state, 'items', {})
-            if item_id in items:
-                item = items[item_id]
-                if item.attributes.get('equipped', False) and item.item_type == "weapon":
-                    weapon_bonus = item.attributes.get('damage', 0)
-
-        total_damage = base_damage + weapon_bonus
-        actual_damage = self.target.take_damage(total_damage)
-        self.actor.energy -= 20
-
-        # Gain experience for dealing damage
-        self.actor.gain_experience(actual_damage)
-
-        # Update relationship
-        current_rel = self.actor.get_relationship(self.target.id)
-        self.actor.set_relationship(self.target.id, current_rel - 20)
-
-        return ActionResult(
-            success=True,
-            message=f"{self.actor.name} attacks {self.target.name} for {actual_damage} damage",
-            data={
-                'damage': actual_damage,
-                'target_health': self.target.health
-            },
-            side_effects=['combat_log_entry']
-        )
+        return execute_attack(world_state, self.actor, self.target)
 
 
 class RestAction(Action):
@@ -245,25 +343,13 @@ class RestAction(Action):
     name = "rest"
     description = "Rest to recover health and energy"
 
+    __slots__ = ()
+
     def check_requirements(self) -> bool:
         return True
 
     def execute(self, world_state: Any) -> ActionResult:
-        # Recover health and energy
-        health_recover = self.actor.attributes.get('health_regen', 5)
-        energy_recover = self.actor.attributes.get('energy_regen', 10)
-
-        actual_heal = self.actor.heal(health_recover)
-        self.actor.energy = min(100, self.actor.energy + energy_recover)
-
-        return ActionResult(
-            success=True,
-            message=f"{self.actor.name} rests and recovers",
-            data={
-                'health_recovered': actual_heal,
-                'energy_recovered': energy_recover
-            }
-        )
+        return execute_rest(world_state, self.actor)
 
 
 class ActionRegistry:
@@ -272,9 +358,20 @@ class ActionRegistry:
     _actions: Dict[str, type] = {}
 
     @classmethod
-    def register(cls, action_class: type):
-        """Register an action class."""
+    def register(cls, action_class: type, function: Optional[Callable[..., ActionResult]] = None):
+        """
+        Register an action class.
+
+        Args:
+            action_class: Action subclass to register under its name
+            function: Optional function implementing the action, called by
+                execute() instead of instantiating the class
+        """
         cls._actions[action_class.name] = action_class
+        if function is not None:
+            ACTION_FNS[action_class.name] = function
+        else:
+            ACTION_FNS.pop(action_class.name, None)
         logger.info(f"Action registered: {action_class.name}")
 
     @classmethod
@@ -290,6 +387,25 @@ class ActionRegistry:
             return action_class(*args, **kwargs)
         return None
 
+    @classmethod
+    def execute(cls, action_name: str, world_state: Any, *args, **kwargs) -> Optional[ActionResult]:
+        """
+        Perform an action without keeping an action object around.
+
+        Args:
+            action_name: Registered action name
+            world_state: The world state to act on
+            *args, **kwargs: Arguments for the action class (actor first)
+
+        Returns:
+            The action result, or None if no such action is registered
+        """
+        function = ACTION_FNS.get(action_name)
+        if function is not None:
+            return function(world_state, *args, **kwargs)
+        action = cls.create(action_name, *args, **kwargs)
+        return action.execute(world_state) if action else None
+
     @classmethod
     def list_actions(cls) -> List[str]:
         """List all registered actions."""
@@ -297,8 +413,8 @@ class ActionRegistry:
 
 
 # Register default actions
-ActionRegistry.register(MoveAction)
-ActionRegistry.register(InteractAction)
-ActionRegistry.register(UseItemAction)
-ActionRegistry.register(AttackAction)
-ActionRegistry.register(RestAction)
+ActionRegistry.register(MoveAction, execute_move)
+ActionRegistry.register(InteractAction, execute_interact)
+ActionRegistry.register(UseItemAction, execute_use_item)
+ActionRegistry.register(AttackAction, execute_attack)
+ActionRegistry.register(RestAction, execute_rest)
@@ -1,9 +1,22 @@
-from typing import Dict, List, Any, Callable, Optional
+import operator
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Dict, Iterable, List, Any, Callable, Optional
 from dataclasses import dataclass, field
+from src.utils.compat import DATACLASS_SLOTS
 from src.utils.logger import logger
 
+# Comparison operators for threshold rules; unknown names fall back to 'gte'
+_COMPARISONS = {
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'eq': operator.eq
+}
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class Rule:
     """Represents a rule that can be applied to the world state."""
     name: str
@@ -36,7 +49,9 @@ class RulesEngine:
 
     def __init__(self):
         self._rules: Dict[str, Rule] = {}
+        # Rule names by descending priority; _rule_keys holds the matching -priority for bisect
         self._rule_order: List[str] = []
+        self._rule_keys: List[int] = []
 
     def register_rule(self, rule: Rule):
         """
@@ -46,10 +61,33 @@ class RulesEngine:
             rule: The rule to register
         """
         self._rules[rule.name] = rule
-        self._rule_order.append(rule.name)
-        self._rule_order.sort(key=lambda n: self._rules[n].priority, reverse=True)
+        # Insert after rules of equal priority, so ties keep registration order
+        key = -rule.priority
+        index = bisect_right(self._rule_keys, key)
+        self._rule_keys.insert(index, key)
+        self._rule_order.insert(index, rule.name)
         logger.info(f"Rule registered: {rule.name}")
 
+    def register_rules(self, rules: Iterable[Rule]):
+        """
+        Register several rules, re-sorting the priority order once.
+
+        Args:
+            rules: The rules to register, in registration order
+        """
+        added = {rule.name: rule for rule in rules}
+        self._rules.update(added)
+        entries = [
+            (key, name) for key, name in zip(self._rule_keys, self._rule_order)
+            if name not in added
+        ]
+        entries.extend((-rule.priority, name) for name, rule in added.items())
+        # Stable sort, so ties keep registration order as in register_rule
+        entries.sort(key=itemgetter(0))
+        self._rule_keys = [key for key, _ in entries]
+        self._rule_order = [name for _, name in entries]
+        logger.info("Rules registered: %s", list(added))
+
     def unregister_rule(self, rule_name: str):
         """
         Unregister a rule.
@@ -59,7 +97,9 @@ class RulesEngine:
         """
         if rule_name in self._rules:
             del self._rules[rule_name]
-            self._rule_order.remove(rule_name)
+            index = self._rule_order.index(rule_name)
+            del self._rule_order[index]
+            del self._rule_keys[index]
             logger.info(f"Rule unregistered: {rule_name}")
 
     def enable_rule(self, rule_name: str):
@@ -85,14 +125,22 @@ class RulesEngine:
             List of rule names that were applied
         """
         applied = []
+        rules = self._rules
         for rule_name in self._rule_order:
-            rule = self._rules[rule_name]
-            if rule.check(world_state):
-                rule.apply(world_state)
+            rule = rules[rule_name]
+            if not rule.enabled:
+                continue
+            # Evaluate the condition once: conditions may have side effects
+            # (periodic rules record their trigger tick) and can be costly
+            condition = rule.condition
+            if condition is None or condition(world_state):
+                action = rule.action
+                if action is not None:
+                    action(world_state)
                 applied.append(rule_name)
 
         if applied:
-            logger.debug(f"Applied rules: {applied}")
+            logger.debug("Applied rules: %s", applied)
 
         return applied
 
@@ -114,6 +162,7 @@ class RulesEngine:
         """Clear all registered rules."""
         self._rules.clear()
         self._rule_order.clear()
+        self._rule_keys.clear()
         logger.info("All rules cleared")
 
 
@@ -141,19 +190,16 @@ class RuleTemplates:
             comparison: Comparison type ('gt', 'gte', 'lt', 'lte', 'eq')
             action: Action to perform when triggered
         """
+        compare = _COMPARISONS.get(comparison, operator.ge)
+        parts = tuple(attribute_path.split('.'))
+
         def condition(world_state):
-            value = RulesEngine._get_attribute(world_state, attribute_path)
-            if value is None:
-                return False
-
-            ops = {
-                'gt': lambda a, b: a > b,
-                'gte': lambda a, b: a >= b,
-                'lt': lambda a, b: a < b,
-                'lte': lambda a, b: a <= b,
-                'eq': lambda a, b: a == b
-            }
-            return ops.get(comparison, lambda a, b: a >= b)(value, threshold)
+            value = world_state
+            for part in parts:
+                value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+                if value is None:
+                    return False
+            return compare(value, threshold)
 
         return Rule(
             name=name,
@@ -11,8 +11,10 @@ from src.utils.llm_client import (
     GeminiProvider,
     OpenAIProvider,
     MockProvider,
+    FallbackResponse,
     create_llm_client
 )
+from src.utils.llm_cache import LLMCache, SemanticLLMCache
 
 __all__ = [
     "setup_logger",
@@ -22,5 +24,8 @@ __all__ = [
     "GeminiProvider",
     "OpenAIProvider",
     "MockProvider",
-    "create_llm_client"
+    "FallbackResponse",
+    "create_llm_client",
+    "LLMCache",
+    "SemanticLLMCache"
 ]
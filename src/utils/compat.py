@@ -0,0 +1,5 @@
+import sys
+
+# Keyword arguments for @dataclass that enable __slots__ where supported (Python 3.10+).
+# On older interpreters dataclasses keep their regular __dict__ storage.
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
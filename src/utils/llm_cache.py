@@ -0,0 +1,194 @@
+"""
+In-process caches for LLM responses.
+
+LLMCache answers exact repeats: responses are keyed by a hash of everything that
+determines them (provider, model, prompt and generation arguments) and evicted
+least recently used first, or once they are older than the configured
+time-to-live. SemanticLLMCache additionally answers near-duplicate prompts by
+embedding similarity; it is opt-in and needs numpy.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only SemanticLLMCache needs it
+    np = None
+
+
+class LLMCache:
+    """Thread-safe LRU cache with an optional TTL for prompt -> response pairs."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600):
+        """
+        Args:
+            maxsize: Maximum number of cached responses; 0 disables the cache
+            ttl: Seconds a response stays valid, or None to keep it until evicted
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider: Any, prompt: str, kwargs: Dict[str, Any]) -> str:
+        """Build the cache key for a provider call."""
+        payload = json.dumps(
+            {
+                "provider": type(provider).__name__,
+                "model": getattr(provider, 'model', None),
+                "prompt": prompt,
+                "kwargs": kwargs
+            },
+            sort_keys=True,
+            default=repr
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, response = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: str):
+        """Store a response, evicting the least recently used entries."""
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached responses and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticLLMCache:
+    """
+    Cache that answers prompts similar to an earlier one with its response.
+
+    Prompt embeddings are kept normalized in one (maxsize, D) matrix, so a
+    lookup is a single matrix-vector product. Entries are only matched within
+    the same partition (e.g. provider, model, style and generation arguments).
+    When full, the least recently used entry is replaced.
+    """
+
+    DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+    def __init__(
+        self,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        threshold: float = 0.92,
+        maxsize: int = 5000,
+        ttl: Optional[float] = 3600
+    ):
+        """
+        Args:
+            embed: Function mapping a prompt to an embedding vector; defaults to
+                DEFAULT_MODEL via sentence-transformers, loaded on first use
+            threshold: Minimum cosine similarity for a cached response to be reused
+            maxsize: Maximum number of cached responses
+            ttl: Seconds a response stays valid, or None to keep it until evicted
+        """
+        if np is None:
+            raise ImportError("SemanticLLMCache requires numpy")
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._embed = embed
+        self._lock = threading.Lock()
+        self._count = 0
+        self._vectors = None  # Allocated once the embedding size is known
+        self._partitions = np.zeros(maxsize, dtype=np.int64)
+        self._stored_at = np.zeros(maxsize, dtype=np.float64)
+        self._last_used = np.zeros(maxsize, dtype=np.float64)
+        self._responses: list = [None] * maxsize
+        self._partition_ids: Dict[str, int] = {}
+
+    def embed(self, prompt: str):
+        """Return the normalized embedding of a prompt."""
+        if self._embed is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise ImportError("SemanticLLMCache needs sentence-transformers or an embed function")
+            model = SentenceTransformer(self.DEFAULT_MODEL)
+            self._embed = model.encode
+        vector = np.asarray(self._embed(prompt), dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, embedding, partition: str) -> Optional[str]:
+        """Return the response of the most similar cached prompt, or None if none is close enough."""
+        with self._lock:
+            count = self._count
+            partition_id = self._partition_ids.get(partition)
+            if count and partition_id is not None:
+                scores = self._vectors[:count] @ embedding
+                scores[self._partitions[:count] != partition_id] = -np.inf
+                now = time.monotonic()
+                if self.ttl is not None:
+                    scores[now - self._stored_at[:count] >= self.ttl] = -np.inf
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self._last_used[best] = now
+                    self.hits += 1
+                    return self._responses[best]
+            self.misses += 1
+            return None
+
+    def set(self, embedding, partition: str, response: str):
+        """Store a response under a prompt embedding."""
+        if not self.maxsize:
+            return
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.maxsize, embedding.shape[0]), dtype=np.float32)
+            if self._count < self.maxsize:
+                slot = self._count
+                self._count += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+            now = time.monotonic()
+            self._vectors[slot] = embedding
+            self._partitions[slot] = self._partition_ids.setdefault(partition, len(self._partition_ids))
+            self._stored_at[slot] = now
+            self._last_used[slot] = now
+            self._responses[slot] = response
+
+    def clear(self):
+        """Drop all cached responses and reset the counters."""
+        with self._lock:
+            self._count = 0
+            self._responses = [None] * self.maxsize
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return self._count
@@ -1,12 +1,88 @@
+import asyncio
+import atexit
+import importlib
 import os
-from typing import Dict, List, Any, Optional
+import re
+import threading
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from abc import ABC, abstractmethod
 from dotenv import load_dotenv
+from src.utils.llm_cache import LLMCache, SemanticLLMCache
 from src.utils.logger import logger
 
 # Load environment variables from .env file
 load_dotenv()
 
+
+class FallbackResponse(str):
+    """Placeholder text returned when a provider could not generate; never cached."""
+
+
+# HTTP connection pool shared by every OpenAIProvider, so keep-alive connections
+# (and their TCP/TLS setup) are reused across providers; created on first use
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _shared_http_client():
+    """Return the process-wide pooled httpx client used by the OpenAI SDK."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                import httpx
+                try:
+                    import h2  # noqa: F401  HTTP/2 is optional in httpx
+                    http2 = True
+                except ImportError:
+                    http2 = False
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+                    timeout=httpx.Timeout(120.0, connect=10.0),
+                    http2=http2
+                )
+                atexit.register(_http_client.close)
+    return _http_client
+
+
+# Provider SDK modules, imported on first use. A missing SDK is remembered as None
+# so providers without it do not search the import path again on every call.
+_sdk_modules: Dict[str, Any] = {}
+
+
+def _import_sdk(name: str) -> Any:
+    """Import a provider SDK module once; raises ImportError if it is not installed."""
+    try:
+        module = _sdk_modules[name]
+    except KeyError:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            module = None
+        _sdk_modules[name] = module
+    if module is None:
+        raise ImportError(f"{name} is not installed")
+    return module
+
+
+# SDK clients per (provider class, model, API key hash), shared by providers with the same config
+_sdk_clients: Dict[Tuple[str, str, int], Any] = {}
+_sdk_clients_lock = threading.Lock()
+
+
+def _shared_sdk_client(provider: 'LLMProvider', factory: Callable[[], Any]) -> Any:
+    """Return the SDK client for a provider's configuration, building it once with factory()."""
+    key = (type(provider).__name__, provider.model, hash(provider.api_key))
+    client = _sdk_clients.get(key)
+    if client is None:
+        with _sdk_clients_lock:
+            client = _sdk_clients.get(key)
+            if client is None:
+                client = factory()
+                _sdk_clients[key] = client
+    return client
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
@@ -25,10 +101,17 @@ class LLMProvider(ABC):
         """Generate text with conversation history."""
         pass
 
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Generate text without blocking the event loop; runs generate() on an executor thread by default."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.generate, prompt, **kwargs))
+
 
 class GeminiProvider(LLMProvider):
     """Google Gemini API provider."""
 
+    _FALLBACK_PREFIX = "[Gemini unavailable] Received prompt: "
+
     def __init__(self, api_key: Optional[str] = None, model: str = "gemini-pro"):
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
         self.model = model
@@ -41,9 +124,7 @@ class GeminiProvider(LLMProvider):
         """Lazy load the Gemini client."""
         if self._client is None:
             try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.api_key)
-                self._client = genai.GenerativeModel(self.model)
+                self._client = _shared_sdk_client(self, self._create_client)
             except ImportError:
                 logger.error("google-generativeai package not installed")
                 return None
@@ -52,6 +133,11 @@ class GeminiProvider(LLMProvider):
                 return None
         return self._client
 
+    def _create_client(self):
+        genai = _import_sdk("google.generativeai")
+        genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(self.model)
+
     def generate(self, prompt: str, **kwargs) -> str:
         """Generate text using Gemini."""
         client = self._get_client()
@@ -65,6 +151,19 @@ class GeminiProvider(LLMProvider):
             logger.error(f"Gemini generation failed: {e}")
             return self._fallback_response(prompt)
 
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Generate text using Gemini's native async API."""
+        client = self._get_client()
+        if not client:
+            return self._fallback_response(prompt)
+
+        try:
+            response = await client.generate_content_async(prompt)
+            return response.text
+        except Exception as e:
+            logger.error(f"Gemini generation failed: {e}")
+            return self._fallback_response(prompt)
+
     def generate_with_history(
         self,
         prompt: str,
@@ -77,11 +176,14 @@ class GeminiProvider(LLMProvider):
             return self._fallback_response(prompt)
 
         try:
-            # Start chat with history
-            chat = client.start_chat(history=[])
-            for msg in conversation_history:
-                role = "user" if msg.get("role") == "user" else "model"
-                chat.send_message(msg.get("content", ""))
+            # Seed the chat with the history in one go instead of re-sending each message
+            chat = client.start_chat(history=[
+                {
+                    "role": "user" if msg.get("role") == "user" else "model",
+                    "parts": [msg.get("content", "")]
+                }
+                for msg in conversation_history
+            ])
 
             response = chat.send_message(prompt)
             return response.text
@@ -91,12 +193,14 @@ class GeminiProvider(LLMProvider):
 
     def _fallback_response(self, prompt: str) -> str:
         """Return a fallback response when API is unavailable."""
-        return f"[Gemini unavailable] Received prompt: {prompt[:100]}..."
+        return FallbackResponse(self._FALLBACK_PREFIX + prompt[:100] + "...")
 
 
 class OpenAIProvider(LLMProvider):
     """OpenAI API provider."""
 
+    _FALLBACK_PREFIX = "[OpenAI unavailable] Received prompt: "
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -113,8 +217,7 @@ class OpenAIProvider(LLMProvider):
         """Lazy load the OpenAI client."""
         if self._client is None:
             try:
-                from openai import OpenAI
-                self._client = OpenAI(api_key=self.api_key)
+                self._client = _shared_sdk_client(self, self._create_client)
             except ImportError:
                 logger.error("openai package not installed")
                 return None
@@ -123,6 +226,9 @@ class OpenAIProvider(LLMProvider):
                 return None
         return self._client
 
+    def _create_client(self):
+        return _import_sdk("openai").OpenAI(api_key=self.api_key, http_client=_shared_http_client())
+
     def generate(self, prompt: str, **kwargs) -> str:
         """Generate text using OpenAI."""
         client = self._get_client()
@@ -165,7 +271,7 @@ class OpenAIProvider(LLMProvider):
 
     def _fallback_response(self, prompt: str) -> str:
         """Return a fallback response when API is unavailable."""
-        return f"[OpenAI unavailable] Received prompt: {prompt[:100]}..."
+        return FallbackResponse(self._FALLBACK_PREFIX + prompt[:100] + "...")
 
 
 class MockProvider(LLMProvider):
@@ -174,6 +280,31 @@ class MockProvider(LLMProvider):
     def __init__(self, responses: Optional[Dict[str, str]] = None):
         self.responses = responses or {}
         self.call_history: List[Dict[str, Any]] = []
+        # Lowercased patterns and a regex matching any of them; rebuilt when responses changes
+        self._pattern_keys: Tuple[str, ...] = ()
+        self._patterns_lower: List[Tuple[str, str]] = []
+        self._pattern_union: Optional[re.Pattern] = None
+
+    def _match_pattern(self, prompt: str) -> Optional[str]:
+        """Return the response of the first pattern contained in the prompt (case-insensitive)."""
+        keys = tuple(self.responses)
+        if keys != self._pattern_keys:
+            self._pattern_keys = keys
+            self._patterns_lower = [(pattern.lower(), pattern) for pattern in keys]
+            self._pattern_union = re.compile(
+                '|'.join(re.escape(lowered) for lowered, _ in self._patterns_lower)
+            ) if keys else None
+
+        if self._pattern_union is None:
+            return None
+        prompt_lower = prompt.lower()
+        # One regex scan rules out misses; on a hit, patterns keep their dict order precedence
+        if self._pattern_union.search(prompt_lower) is None:
+            return None
+        for lowered, pattern in self._patterns_lower:
+            if lowered in prompt_lower:
+                return self.responses[pattern]
+        return None
 
     def generate(self, prompt: str, **kwargs) -> str:
         """Generate mock response."""
@@ -188,13 +319,17 @@ class MockProvider(LLMProvider):
             return self.responses[prompt]
 
         # Check for pattern match
-        for pattern, response in self.responses.items():
-            if pattern.lower() in prompt.lower():
-                return response
+        response = self._match_pattern(prompt)
+        if response is not None:
+            return response
 
         # Default mock response
         return f"[Mock] Generated response for: {prompt[:50]}..."
 
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Generate mock response; no I/O, so no executor thread."""
+        return self.generate(prompt, **kwargs)
+
     def generate_with_history(
         self,
         prompt: str,
@@ -212,30 +347,57 @@ class MockProvider(LLMProvider):
         return self.generate(prompt, **kwargs)
 
 
+# Writing style -> instruction appended to prompts by LLMClient
+_STYLE_INSTRUCTIONS: Dict[str, str] = {
+    'default': "Write in a clear, engaging style.",
+    'narrative': "Write as a compelling story with vivid descriptions.",
+    'dramatic': "Write with dramatic tension and emotional intensity.",
+    'humorous': "Write with wit and humor.",
+    'formal': "Write in a formal, professional tone.",
+    'casual': "Write in a casual, conversational tone.",
+    'poetic': "Write with poetic language and imagery.",
+    'technical': "Write with precise, technical language."
+}
+
+# Prebuilt prompt suffixes, so applying a style is a single concatenation
+_STYLE_SUFFIX: Dict[str, str] = {style: f"\n\n{instruction}" for style, instruction in _STYLE_INSTRUCTIONS.items()}
+_DEFAULT_STYLE_SUFFIX = _STYLE_SUFFIX['default']
+
+
 class LLMClient:
     """
     Unified LLM client that supports multiple providers.
     Provides a consistent interface for all LLM operations.
     """
 
-    def __init__(self, provider: Optional[LLMProvider] = None):
+    def __init__(
+        self,
+        provider: Optional[LLMProvider] = None,
+        cache_size: int = 1024,
+        cache_ttl: Optional[float] = 3600,
+        semantic_cache: Optional[SemanticLLMCache] = None
+    ):
         self.provider = provider or self._auto_detect_provider()
+        # Responses to repeated prompts; cache_size=0 disables it
+        self._cache = LLMCache(maxsize=cache_size, ttl=cache_ttl)
+        # Opt-in: responses to near-duplicate prompts, checked after an exact miss
+        self.semantic_cache = semantic_cache
         logger.info(f"Using LLM provider: {type(self.provider).__name__}")
 
+    @property
+    def cache_hits(self) -> int:
+        """Number of generate() calls answered from the response cache."""
+        return self._cache.hits
+
+    @property
+    def cache_misses(self) -> int:
+        """Number of cacheable generate() calls that reached the provider."""
+        return self._cache.misses
+
     @staticmethod
     def _auto_detect_provider() -> LLMProvider:
         """Auto-detect and initialize the best available provider."""
-        # Try Gemini first (as per project docs)
-        if os.environ.get("GEMINI_API_KEY"):
-            return GeminiProvider()
-
-        # Try OpenAI
-        if os.environ.get("OPENAI_API_KEY"):
-            return OpenAIProvider()
-
-        # Fall back to mock
-        logger.info("No API keys found. Using MockProvider for testing.")
-        return MockProvider()
+        return _PROVIDERS[_detect_provider_type()]()
 
     def generate(
         self,
@@ -246,6 +408,11 @@ class LLMClient:
         """
         Generate text from a prompt.
 
+        Identical requests are answered from the response cache unless a
+        positive temperature asks for varied output; with a semantic cache,
+        close paraphrases of earlier prompts are answered too. Fallback text
+        from an unavailable provider is not cached.
+
         Args:
             prompt: Input prompt
             style: Optional writing style to apply
@@ -257,7 +424,122 @@ class LLMClient:
         if style:
             prompt = self._apply_style(prompt, style)
 
-        return self.provider.generate(prompt, **kwargs)
+        if not self._cacheable(kwargs):
+            return self.provider.generate(prompt, **kwargs)
+
+        response, store = self._lookup(prompt, style, kwargs)
+        if response is None:
+            response = self.provider.generate(prompt, **kwargs)
+            store(response)
+        return response
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        style: Optional[str] = None,
+        max_concurrency: int = 10,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate text for several prompts concurrently.
+
+        Blocking wrapper around generate_batch_async(); call that one instead
+        from code already running in an event loop.
+
+        Returns:
+            Generated text per prompt, in the order given
+        """
+        return asyncio.run(self.generate_batch_async(prompts, style, max_concurrency, **kwargs))
+
+    async def generate_batch_async(
+        self,
+        prompts: List[str],
+        style: Optional[str] = None,
+        max_concurrency: int = 10,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate text for several prompts with up to max_concurrency requests in flight.
+
+        Cached prompts are answered without a request, and identical prompts in
+        the batch share one request, under the same rules as generate().
+
+        Args:
+            prompts: Input prompts
+            style: Optional writing style applied to every prompt
+            max_concurrency: Maximum concurrent provider requests
+            **kwargs: Additional provider-specific arguments
+
+        Returns:
+            Generated text per prompt, in the order given
+        """
+        if style:
+            prompts = [self._apply_style(prompt, style) for prompt in prompts]
+        cacheable = self._cacheable(kwargs)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(prompt: str) -> str:
+            store = None
+            if cacheable:
+                response, store = self._lookup(prompt, style, kwargs)
+                if response is not None:
+                    return response
+            async with semaphore:
+                response = await self.provider.agenerate(prompt, **kwargs)
+            if store is not None:
+                store(response)
+            return response
+
+        tasks: Dict[str, asyncio.Future] = {}
+        batch = []
+        for prompt in prompts:
+            task = tasks.get(prompt) if cacheable else None
+            if task is None:
+                task = asyncio.ensure_future(run(prompt))
+                tasks[prompt] = task
+            batch.append(task)
+        return list(await asyncio.gather(*batch))
+
+    def _cacheable(self, kwargs: Dict[str, Any]) -> bool:
+        """Whether a request may be answered from the cache; a positive temperature asks for variety."""
+        return bool(self._cache.maxsize) and not (kwargs.get('temperature') or 0) > 0
+
+    def _lookup(
+        self,
+        prompt: str,
+        style: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[str], Callable[[str], None]]:
+        """
+        Look a styled prompt up in the exact cache, then the semantic cache.
+
+        Returns:
+            The cached response or None, and a function storing a fresh response
+        """
+        cache = self._cache
+        key = cache.make_key(self.provider, prompt, kwargs)
+        response = cache.get(key)
+        if response is not None:
+            return response, None
+
+        semantic = self.semantic_cache
+        embedding = partition = None
+        if semantic is not None:
+            # Only prompts with the same provider, model, style and arguments are comparable
+            partition = cache.make_key(self.provider, "", dict(kwargs, style=style))
+            embedding = semantic.embed(prompt)
+            response = semantic.get(embedding, partition)
+            if response is not None:
+                cache.set(key, response)
+                return response, None
+
+        def store(response: str):
+            if not isinstance(response, FallbackResponse):
+                cache.set(key, response)
+                if semantic is not None:
+                    semantic.set(embedding, partition, response)
+
+        return None, store
 
     def generate_with_history(
         self,
@@ -287,23 +569,7 @@ class LLMClient:
 
     def _apply_style(self, prompt: str, style: str) -> str:
         """Apply a writing style to the prompt."""
-        style_instructions = {
-            'default': "Write in a clear, engaging style.",
-            'narrative': "Write as a compelling story with vivid descriptions.",
-            'dramatic': "Write with dramatic tension and emotional intensity.",
-            'humorous': "Write with wit and humor.",
-            'formal': "Write in a formal, professional tone.",
-            'casual': "Write in a casual, conversational tone.",
-            'poetic': "Write with poetic language and imagery.",
-            'technical': "Write with precise, technical language."
-        }
-
-        instruction = style_instructions.get(
-            style,
-            style_instructions['default']
-        )
-
-        return f"{prompt}\n\n{instruction}"
+        return prompt + _STYLE_SUFFIX.get(style, _DEFAULT_STYLE_SUFFIX)
 
     def summarize(self, text: str, max_length: int = 100) -> str:
         """Summarize a piece of text."""
@@ -333,24 +599,57 @@ Continue the narrative:"""
         return self.generate(prompt, style='narrative')
 
 
+_PROVIDERS = {
+    'gemini': GeminiProvider,
+    'openai': OpenAIProvider,
+    'mock': MockProvider
+}
+
+# Clients for real providers, shared by every create_llm_client() call for that provider type
+_shared_clients: Dict[str, LLMClient] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _detect_provider_type() -> str:
+    """Pick the best available provider type from the configured API keys."""
+    # Try Gemini first (as per project docs)
+    if os.environ.get("GEMINI_API_KEY"):
+        return 'gemini'
+
+    # Try OpenAI
+    if os.environ.get("OPENAI_API_KEY"):
+        return 'openai'
+
+    # Fall back to mock
+    logger.info("No API keys found. Using MockProvider for testing.")
+    return 'mock'
+
+
 # Convenience function for quick initialization
 def create_llm_client(provider_type: Optional[str] = None) -> LLMClient:
     """
     Create an LLM client with the specified provider.
 
+    Gemini and OpenAI clients are created once per provider type and shared,
+    together with their SDK client and response cache. Mock clients are always
+    new, so each keeps its own call history.
+
     Args:
         provider_type: 'gemini', 'openai', 'mock', or None for auto-detect
 
     Returns:
         Configured LLMClient instance
     """
-    if provider_type == 'gemini':
-        provider = GeminiProvider()
-    elif provider_type == 'openai':
-        provider = OpenAIProvider()
-    elif provider_type == 'mock':
-        provider = MockProvider()
-    else:
-        return LLMClient()  # Auto-detect
-
-    return LLMClient(provider)
+    if provider_type not in _PROVIDERS:
+        provider_type = _detect_provider_type()
+    if provider_type == 'mock':
+        return LLMClient(MockProvider())
+
+    client = _shared_clients.get(provider_type)
+    if client is None:
+        with _shared_clients_lock:
+            client = _shared_clients.get(provider_type)
+            if client is None:
+                client = LLMClient(_PROVIDERS[provider_type]())
+                _shared_clients[provider_type] = client
+    return client
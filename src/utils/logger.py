@@ -1,23 +1,36 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 
 def setup_logger(name, log_file, level=logging.INFO):
-    """Function to setup as many loggers as you want"""
+    """
+    Function to setup as many loggers as you want.
+
+    The logger itself only enqueues records; a background listener thread does
+    the file and console writes, so logging never blocks the calling thread on I/O.
+    """
     formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
 
     # Ensure log directory exists
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
-    handler = logging.FileHandler(log_file)        
+    handler = logging.FileHandler(log_file)
     handler.setFormatter(formatter)
 
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
 
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler, console_handler)
+    listener.start()
+    # Drain queued records before the interpreter exits
+    atexit.register(listener.stop)
+
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    logger.addHandler(handler)
-    logger.addHandler(console_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     return logger
 
@@ -4,10 +4,11 @@ RIWA2 Universe Module
 World definitions and base classes.
 """
 
-from universe.base_world import BaseWorld, WorldConfig, WorldRegistry
+from universe.base_world import BaseWorld, LoggedEvent, WorldConfig, WorldRegistry
 
 __all__ = [
     "BaseWorld",
+    "LoggedEvent",
     "WorldConfig",
     "WorldRegistry"
 ]
@@ -1,15 +1,49 @@
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Collection, Deque, Dict, List, NamedTuple, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from collections import deque
+from functools import lru_cache
+from heapq import heapify, heappop, heappush
+from itertools import count, islice
 from dataclasses import dataclass, field
 from datetime import datetime
+import logging
 import os
+import pickle
+import sys
+import threading
 import yaml
+from src.core.clock import tick_timestamp
 from src.core.entities import Character, Item, Location
 from src.core.event_bus import EventBus, Event
 from src.modules.world_mod.rules import RulesEngine
+from src.utils.compat import DATACLASS_SLOTS
 from src.utils.logger import logger
 
+# libyaml's C loader parses far faster when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-@dataclass
+
+@lru_cache(maxsize=64)
+def _load_yaml(path: str, mtime_ns: int) -> bytes:
+    """
+    Parse a YAML file, memoized per path and modification time.
+    The result is cached pickled, so each caller unpickles its own copy.
+    """
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class LoggedEvent(NamedTuple):
+    """A logged event together with the world tick it happened in, as returned by BaseWorld."""
+    tick: int
+    event_type: str
+    data: Dict[str, Any]
+    source: str
+    timestamp: str
+
+
+@dataclass(**DATACLASS_SLOTS)
 class WorldConfig:
     """Configuration for a world instance."""
     name: str = "Unnamed World"
@@ -17,6 +51,7 @@ class WorldConfig:
     theme: str = "generic"
     tick_rate: float = 1.0
     max_ticks: int = -1  # -1 for unlimited
+    event_log_max: int = 10_000  # Oldest events are dropped beyond this
     initial_characters: List[Dict[str, Any]] = field(default_factory=list)
     initial_items: List[Dict[str, Any]] = field(default_factory=list)
     initial_locations: List[Dict[str, Any]] = field(default_factory=list)
@@ -25,21 +60,9 @@ class WorldConfig:
 
     @classmethod
     def from_yaml(cls, filepath: str) -> 'WorldConfig':
-        """Load configuration from a YAML file."""
-        with open(filepath, 'r') as f:
-            data = yaml.safe_load(f)
-        return cls(
-            name=data.get('name', 'Unnamed World'),
-            description=data.get('description', ''),
-            theme=data.get('theme', 'generic'),
-            tick_rate=data.get('tick_rate', 1.0),
-            max_ticks=data.get('max_ticks', -1),
-            initial_characters=data.get('initial_characters', []),
-            initial_items=data.get('initial_items', []),
-            initial_locations=data.get('initial_locations', []),
-            custom_rules=data.get('custom_rules', []),
-            world_properties=data.get('world_properties', {})
-        )
+        """Load configuration from a YAML file; unchanged files are parsed only once."""
+        path = os.path.abspath(filepath)
+        return cls.from_dict(pickle.loads(_load_yaml(path, os.stat(path).st_mtime_ns)))
 
     @classmethod
     def from_dict(cls, data: dict) -> 'WorldConfig':
@@ -50,6 +73,7 @@ class WorldConfig:
             theme=data.get('theme', 'generic'),
             tick_rate=data.get('tick_rate', 1.0),
             max_ticks=data.get('max_ticks', -1),
+            event_log_max=data.get('event_log_max', 10_000),
             initial_characters=data.get('initial_characters', []),
             initial_items=data.get('initial_items', []),
             initial_locations=data.get('initial_locations', []),
@@ -64,6 +88,15 @@ class BaseWorld:
     Provides core functionality for world simulation, entity management, and event handling.
     """
 
+    # Subclasses without their own __slots__ still get a __dict__ for extra state
+    __slots__ = (
+        'world_id', 'config', 'event_bus', 'tick_count', 'is_running',
+        'characters', 'items', 'locations',
+        '_char_name_idx', '_item_name_idx', '_loc_name_idx',
+        'rules_engine', '_periodic_actions', '_periodic_seq',
+        'event_log', '_event_ticks', '__weakref__'
+    )
+
     def __init__(
         self,
         world_id: str,
@@ -83,16 +116,29 @@ class BaseWorld:
         self.items: Dict[str, Item] = {}
         self.locations: Dict[str, Location] = {}
 
+        # Lowercase name -> insertion-ordered set of ids with that name; see _find_by_name
+        self._char_name_idx: Dict[str, Dict[str, None]] = {}
+        self._item_name_idx: Dict[str, Dict[str, None]] = {}
+        self._loc_name_idx: Dict[str, Dict[str, None]] = {}
+
         # Systems
         self.rules_engine = RulesEngine()
-
-        # Event logs for story generation
-        self.event_log: List[Dict[str, Any]] = []
+        # Heap of (due tick, sequence, interval, action, name) for schedule_periodic;
+        # the sequence keeps actions due on the same tick in scheduling order
+        self._periodic_actions: List[Tuple[int, int, int, Callable[[Any], None], Optional[str]]] = []
+        self._periodic_seq = count()
+
+        # Event logs for story generation, in tick order. The bus's Event objects
+        # are stored as-is; _event_ticks holds each one's tick so tick ranges can
+        # be bisected. Both drop their oldest entries together once event_log_max
+        # is reached.
+        self.event_log: Deque[Event] = deque(maxlen=self.config.event_log_max)
+        self._event_ticks: Deque[int] = deque(maxlen=self.config.event_log_max)
 
         # Subscribe to events
         self._setup_event_handlers()
 
-        logger.info(f"World initialized: {self.world_id}")
+        logger.info("World initialized: %s", self.world_id)
 
     def _setup_event_handlers(self):
         """Setup event handlers for the world."""
@@ -100,17 +146,12 @@ class BaseWorld:
 
     def _on_any_event(self, event: Event):
         """Handle any event for logging."""
-        self.event_log.append({
-            'tick': self.tick_count,
-            'event_type': event.event_type,
-            'data': event.data,
-            'source': event.source,
-            'timestamp': event.timestamp
-        })
+        self.event_log.append(event)
+        self._event_ticks.append(self.tick_count)
 
     def initialize(self):
         """Initialize the world with config data."""
-        logger.info(f"Initializing world: {self.config.name}")
+        logger.info("Initializing world: %s", self.config.name)
 
         # Create initial locations
         for loc_data in self.config.initial_locations:
@@ -127,8 +168,8 @@ class BaseWorld:
         # Register custom rules
         self._register_custom_rules()
 
-        logger.info(f"World initialized with {len(self.locations)} locations, "
-                   f"{len(self.items)} items, {len(self.characters)} characters")
+        logger.info("World initialized with %d locations, %d items, %d characters",
+                    len(self.locations), len(self.items), len(self.characters))
 
     def _register_custom_rules(self):
         """Register custom rules from config."""
@@ -138,7 +179,11 @@ class BaseWorld:
     def create_character(self, data: Dict[str, Any]) -> Character:
         """Create a character in the world."""
         character = Character.from_dict(data)
+        if character.location:
+            # Interned like location ids, so location lookups compare by identity
+            character.location = sys.intern(character.location)
         self.characters[character.id] = character
+        self._char_name_idx.setdefault(character.name.lower(), {})[character.id] = None
 
         # Place character in location if specified
         if character.location and character.location in self.locations:
@@ -150,13 +195,14 @@ class BaseWorld:
             source=self.world_id
         )
 
-        logger.info(f"Character created: {character.name} ({character.id})")
+        logger.info("Character created: %s (%s)", character.name, character.id)
         return character
 
     def create_item(self, data: Dict[str, Any]) -> Item:
         """Create an item in the world."""
         item = Item.from_dict(data)
         self.items[item.id] = item
+        self._item_name_idx.setdefault(item.name.lower(), {})[item.id] = None
 
         # Place item in location if specified
         if item.location and item.location in self.locations:
@@ -168,13 +214,16 @@ class BaseWorld:
             source=self.world_id
         )
 
-        logger.info(f"Item created: {item.name} ({item.id})")
+        logger.info("Item created: %s (%s)", item.name, item.id)
         return item
 
     def create_location(self, data: Dict[str, Any]) -> Location:
         """Create a location in the world."""
         location = Location.from_dict(data)
+        # Location ids are a small fixed set compared constantly; intern them
+        location.id = sys.intern(location.id)
         self.locations[location.id] = location
+        self._loc_name_idx.setdefault(location.name.lower(), {})[location.id] = None
 
         self.event_bus.emit(
             'location_created',
@@ -182,9 +231,58 @@ class BaseWorld:
             source=self.world_id
         )
 
-        logger.info(f"Location created: {location.name} ({location.id})")
+        logger.info("Location created: %s (%s)", location.name, location.id)
         return location
 
+    def rebuild_indexes(self):
+        """
+        Rebuild the lookup indexes from the entity dicts.
+        Call after filling characters, items or locations directly rather than
+        through the create_* methods, e.g. when restoring a snapshot.
+        """
+        for entities, index in (
+            (self.characters, self._char_name_idx),
+            (self.items, self._item_name_idx),
+            (self.locations, self._loc_name_idx),
+        ):
+            index.clear()
+            for entity in entities.values():
+                index.setdefault(entity.name.lower(), {})[entity.id] = None
+
+    def rename_character(self, character: Character, name: str):
+        """Set a character's name, keeping the name index in sync."""
+        self._unindex_name(self._char_name_idx, character.name, character.id)
+        character.name = name
+        self._char_name_idx.setdefault(name.lower(), {})[character.id] = None
+
+    @staticmethod
+    def _unindex_name(index: Dict[str, Dict[str, None]], name: str, entity_id: str):
+        """Drop an entity id from the name index."""
+        name_lower = name.lower()
+        ids = index.get(name_lower)
+        if ids is not None:
+            ids.pop(entity_id, None)
+            if not ids:
+                del index[name_lower]
+
+    def move_character(self, character: Character, destination: Optional[str]):
+        """Set a character's location, keeping the locations' character sets in sync."""
+        locations = self.locations
+        old_location = locations.get(character.location) if character.location else None
+        if old_location is not None:
+            old_location.remove_character(character.id)
+        character.location = sys.intern(destination) if destination else destination
+        if destination in locations:
+            locations[destination].add_character(character.id)
+
+    def character_ids_at(self, location_id: str) -> Collection[str]:
+        """
+        Return the ids of the characters at a location (empty for unknown locations).
+        This is the location's own character set; do not modify it.
+        """
+        location = self.locations.get(location_id)
+        return location.characters if location is not None else ()
+
     def remove_character(self, character_id: str):
         """Remove a character from the world."""
         if character_id not in self.characters:
@@ -197,6 +295,7 @@ class BaseWorld:
             self.locations[character.location].remove_character(character_id)
 
         del self.characters[character_id]
+        self._unindex_name(self._char_name_idx, character.name, character_id)
 
         self.event_bus.emit(
             'character_removed',
@@ -204,7 +303,7 @@ class BaseWorld:
             source=self.world_id
         )
 
-        logger.info(f"Character removed: {character.name}")
+        logger.info("Character removed: %s", character.name)
 
     def tick(self):
         """
@@ -213,17 +312,82 @@ class BaseWorld:
         """
         self.tick_count += 1
 
-        # Apply rules
-        self.rules_engine.apply_rules(self)
+        with tick_timestamp():
+            # Apply rules
+            self.rules_engine.apply_rules(self)
+            self._run_periodic_actions()
 
-        # Emit tick event
-        self.event_bus.emit(
-            'tick_completed',
-            {'tick': self.tick_count},
-            source=self.world_id
+            # Emit tick event
+            self.event_bus.emit(
+                'tick_completed',
+                {'tick': self.tick_count},
+                source=self.world_id
+            )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("World %s tick %s completed", self.world_id, self.tick_count)
+
+    def schedule_periodic(self, interval: int, action: Callable[[Any], None], name: Optional[str] = None):
+        """
+        Run an action every interval ticks, starting interval ticks from now.
+
+        Unlike a periodic rule, the action is not checked on the ticks in
+        between; it runs after the rules of the tick it is due on. Scheduled
+        actions are not rules, so the rules engine cannot disable them; use
+        cancel_periodic instead.
+
+        Args:
+            interval: Number of ticks between runs
+            action: Called with the world
+            name: Optional name for cancel_periodic
+        """
+        heappush(
+            self._periodic_actions,
+            (self.tick_count + interval, next(self._periodic_seq), interval, action, name)
         )
 
-        logger.debug(f"World {self.world_id} tick {self.tick_count} completed")
+    def cancel_periodic(self, name: str) -> bool:
+        """
+        Stop running the scheduled actions with the given name.
+
+        Args:
+            name: Name the actions were scheduled under
+
+        Returns:
+            True if any action was cancelled
+        """
+        heap = self._periodic_actions
+        kept = [entry for entry in heap if entry[4] != name]
+        if len(kept) == len(heap):
+            return False
+        heapify(kept)
+        self._periodic_actions = kept
+        return True
+
+    def rebase_periodic_actions(self):
+        """
+        Recompute the due ticks of the scheduled actions from tick_count.
+
+        Call after tick_count jumps, e.g. when a snapshot is restored. Each action
+        keeps its phase, so it next runs on the first tick after tick_count that
+        its original schedule would have run on.
+        """
+        tick = self.tick_count
+        heap = [
+            (tick + ((due - tick) % interval or interval), seq, interval, action, name)
+            for due, seq, interval, action, name in self._periodic_actions
+        ]
+        heapify(heap)
+        self._periodic_actions = heap
+
+    def _run_periodic_actions(self):
+        """Run the scheduled actions that are due and reschedule them."""
+        heap = self._periodic_actions
+        tick = self.tick_count
+        while heap and heap[0][0] <= tick:
+            _, seq, interval, action, name = heappop(heap)
+            action(self)
+            heappush(heap, (tick + interval, seq, interval, action, name))
 
     def get_state(self) -> Dict[str, Any]:
         """Get the current world state as a dictionary."""
@@ -237,65 +401,115 @@ class BaseWorld:
             'characters': {k: v.to_dict() for k, v in self.characters.items()},
             'items': {k: v.to_dict() for k, v in self.items.items()},
             'locations': {k: v.to_dict() for k, v in self.locations.items()},
-            'event_log': self.event_log[-100:]  # Last 100 events
+            'event_log': [e._asdict() for e in self._event_slice(len(self.event_log) - 100)]  # Last 100 events
         }
 
     def to_dict(self) -> Dict[str, Any]:
         """Alias for get_state()."""
         return self.get_state()
 
-    def get_events_since(self, tick: int) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _deque_slice(entries: deque, start: int, stop: int) -> list:
+        """Copy entries[start:stop], walking the deque from whichever end is nearer."""
+        size = len(entries)
+        if start > size - stop:
+            sliced = list(islice(reversed(entries), size - stop, size - start))
+            sliced.reverse()
+            return sliced
+        return list(islice(entries, start, stop))
+
+    def _event_slice(self, start: int, stop: Optional[int] = None) -> List[LoggedEvent]:
+        """Return event_log[start:stop] as LoggedEvent records."""
+        size = len(self.event_log)
+        start = max(0, start)
+        stop = size if stop is None else min(stop, size)
+        if start >= stop:
+            return []
+        return [
+            LoggedEvent(tick, event.event_type, event.data, event.source, event.timestamp)
+            for tick, event in zip(
+                self._deque_slice(self._event_ticks, start, stop),
+                self._deque_slice(self.event_log, start, stop)
+            )
+        ]
+
+    def get_events_since(self, tick: int) -> List[LoggedEvent]:
         """Get events that occurred after a specific tick."""
-        return [e for e in self.event_log if e['tick'] > tick]
+        return self._event_slice(bisect_right(self._event_ticks, tick))
 
-    def get_events_between(self, start_tick: int, end_tick: int) -> List[Dict[str, Any]]:
+    def get_events_between(self, start_tick: int, end_tick: int) -> List[LoggedEvent]:
         """Get events that occurred between two ticks."""
-        return [e for e in self.event_log
-                if start_tick <= e['tick'] <= end_tick]
+        ticks = self._event_ticks
+        return self._event_slice(bisect_left(ticks, start_tick), bisect_right(ticks, end_tick))
 
     def clear_event_log(self, before_tick: Optional[int] = None):
         """Clear the event log, optionally keeping events after a tick."""
         if before_tick is None:
             self.event_log.clear()
+            self._event_ticks.clear()
         else:
-            self.event_log = [e for e in self.event_log if e['tick'] >= before_tick]
+            for _ in range(bisect_left(self._event_ticks, before_tick)):
+                self.event_log.popleft()
+                self._event_ticks.popleft()
 
-    def find_character_by_name(self, name: str) -> Optional[Character]:
-        """Find a character by name (case-insensitive)."""
-        name_lower = name.lower()
-        for char in self.characters.values():
-            if char.name.lower() == name_lower:
-                return char
+    @staticmethod
+    def _find_by_name(entities: Dict[str, Any], index: Dict[str, Dict[str, None]], key: str) -> Optional[Any]:
+        """
+        Look up an entity by id, then by lowercase name through its name index.
+
+        The entities are never scanned: code that fills the entity dicts directly
+        must call rebuild_indexes(), and renames go through rename_character().
+        Index hits are still checked against the entity's current name.
+        """
+        entity = entities.get(key)
+        if entity is not None:
+            return entity
+        name_lower = key.lower()
+        for entity_id in index.get(name_lower, ()):
+            entity = entities.get(entity_id)
+            if entity is not None and entity.name.lower() == name_lower:
+                return entity
         return None
 
+    def find_character_by_name(self, name: str) -> Optional[Character]:
+        """Find a character by id or name (case-insensitive)."""
+        return self._find_by_name(self.characters, self._char_name_idx, name)
+
     def find_location_by_name(self, name: str) -> Optional[Location]:
-        """Find a location by name (case-insensitive)."""
-        name_lower = name.lower()
-        for loc in self.locations.values():
-            if loc.name.lower() == name_lower:
-                return loc
-        return None
+        """Find a location by id or name (case-insensitive)."""
+        return self._find_by_name(self.locations, self._loc_name_idx, name)
 
     def find_item_by_name(self, name: str) -> Optional[Item]:
-        """Find an item by name (case-insensitive)."""
-        name_lower = name.lower()
-        for item in self.items.values():
-            if item.name.lower() == name_lower:
-                return item
-        return None
+        """Find an item by id or name (case-insensitive)."""
+        return self._find_by_name(self.items, self._item_name_idx, name)
 
 
 # World registry for managing multiple worlds
 class WorldRegistry:
-    """Registry for managing multiple world instances."""
+    """
+    Registry for managing multiple world instances.
+
+    Changes are serialized by a lock; lookups read the dict without locking,
+    since single dict operations are atomic.
+    """
 
     _worlds: Dict[str, BaseWorld] = {}
+    _lock = threading.Lock()
 
     @classmethod
-    def register(cls, world: BaseWorld):
-        """Register a world."""
-        cls._worlds[world.world_id] = world
-        logger.info(f"World registered: {world.world_id}")
+    def register(cls, world: BaseWorld) -> bool:
+        """
+        Register a world. Registering the same world object again is a no-op.
+
+        Returns:
+            True if the registry changed, False if the world was already registered
+        """
+        with cls._lock:
+            if cls._worlds.get(world.world_id) is world:
+                return False
+            cls._worlds[world.world_id] = world
+        logger.info("World registered: %s", world.world_id)
+        return True
 
     @classmethod
     def get(cls, world_id: str) -> Optional[BaseWorld]:
@@ -305,19 +519,20 @@ class WorldRegistry:
     @classmethod
     def list_worlds(cls) -> List[str]:
         """List all registered world IDs."""
-        return list(cls._worlds.keys())
+        return list(cls._worlds)
 
     @classmethod
     def remove(cls, world_id: str) -> bool:
         """Remove a world from the registry."""
-        if world_id in cls._worlds:
-            del cls._worlds[world_id]
-            logger.info(f"World removed: {world_id}")
-            return True
-        return False
+        with cls._lock:
+            if cls._worlds.pop(world_id, None) is None:
+                return False
+        logger.info("World removed: %s", world_id)
+        return True
 
     @classmethod
     def clear(cls):
         """Clear all registered worlds."""
-        cls._worlds.clear()
+        with cls._lock:
+            cls._worlds.clear()
         logger.info("World registry cleared")
@@ -5,13 +5,100 @@ A cyberpunk-themed world implementation for RIWA2.
 Features corporate intrigue, netrunning, and street-level survival.
 """
 
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Set
+from bisect import bisect_right
+from collections import defaultdict
+from types import MappingProxyType
+import logging
 import os
+import sys
 from src.core.entities import Character, Item
-from src.modules.world_mod.rules import Rule, RuleTemplates
+from src.modules.world_mod.rules import Rule
 from universe.base_world import BaseWorld, WorldConfig
 from src.utils.logger import logger
 
+_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
+
+# Location ids the world's rules watch; interned to match the ids BaseWorld interns
+CORPORATE_TOWER = sys.intern("corporate_tower")
+NETRUNNER_HIDEOUT = sys.intern("netrunner_hideout")
+SLUMS = sys.intern("slums")
+
+# Faction status by reputation: each threshold is the lowest reputation of the next status
+_FACTION_THRESHOLDS = (-80, -40, 40, 80)
+_FACTION_STATUS = ("enemy", "hostile", "neutral", "friendly", "allied")
+
+
+def _keycard_or_stealth(keycard_name: str, min_stealth: int) -> Callable[['CyberpunkCityWorld', Character], bool]:
+    """Build an access check passed by holding the named keycard or having enough stealth."""
+    def check(world: 'CyberpunkCityWorld', character: Character) -> bool:
+        if character.attributes.get("stealth", 0) >= min_stealth:
+            return True
+        keycard_ids = world._item_ids_by_name.get(keycard_name)
+        return bool(keycard_ids) and not character.inventory.keys().isdisjoint(keycard_ids)
+    return check
+
+
+# Access requirements of restricted locations: location id -> (check, display name)
+_ACCESS_CHECKS = {
+    # Corporate tower requires keycard or high stealth
+    CORPORATE_TOWER: (_keycard_or_stealth("Level 5 Keycard", 20), "Corporate Tower")
+}
+
+
+
+# Rule functions: shared by all worlds, each acts on the world it is passed
+
+# Rule: Corporate surveillance increases when in corporate zones
+def _check_surveillance(world: 'CyberpunkCityWorld') -> bool:
+    # Any character in the corporate zone
+    return bool(world.character_ids_at(CORPORATE_TOWER))
+
+
+def _apply_surveillance(world: 'CyberpunkCityWorld'):
+    level = world.surveillance_level + 1
+    level = level if level < 5 else 5
+    world.surveillance_level = level
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Corporate surveillance level increased to %s", level)
+
+
+# Rule: Passive surveillance decay
+def _decay_surveillance(world: 'CyberpunkCityWorld'):
+    if world.surveillance_level > 0:
+        world.surveillance_level -= 1
+
+
+# Rule: Netrunner hideout reduces surveillance
+def _check_hideout(world: 'CyberpunkCityWorld') -> bool:
+    return bool(world.character_ids_at(NETRUNNER_HIDEOUT))
+
+
+def _apply_hideout(world: 'CyberpunkCityWorld'):
+    level = world.surveillance_level - 2
+    world.surveillance_level = level if level > 0 else 0
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Surveillance reduced by netrunner countermeasures")
+
+
+def _make_rules() -> List[Rule]:
+    """Build a world's own rule objects; rules are per world since they can be disabled."""
+    return [
+        Rule(
+            name="corporate_surveillance",
+            description="Surveillance increases when in corporate zones",
+            priority=5,
+            condition=_check_surveillance,
+            action=_apply_surveillance
+        ),
+        Rule(
+            name="netrunner_countermeasures",
+            description="Netrunner hideout reduces surveillance",
+            priority=6,
+            condition=_check_hideout,
+            action=_apply_hideout
+        )
+    ]
 
 class CyberpunkCityWorld(BaseWorld):
     """
@@ -24,16 +111,13 @@ class CyberpunkCityWorld(BaseWorld):
     - Black market economy
     """
 
-    def __init__(self, world_id: str = "cyberpunk_city"):
-        # Load config from file
-        config_path = os.path.join(
-            os.path.dirname(__file__),
-            "config.yaml"
-        )
+    __slots__ = ('faction_reputation', 'surveillance_level', '_item_ids_by_name')
 
-        if os.path.exists(config_path):
-            config = WorldConfig.from_yaml(config_path)
-        else:
+    def __init__(self, world_id: str = "cyberpunk_city"):
+        # Load config from file; from_yaml only re-parses it after it changed
+        try:
+            config = WorldConfig.from_yaml(_CONFIG_PATH)
+        except FileNotFoundError:
             config = WorldConfig(
                 name="Neo Tokyo 2087",
                 theme="cyberpunk",
@@ -52,62 +136,29 @@ class CyberpunkCityWorld(BaseWorld):
         # Surveillance level (0-5)
         self.surveillance_level = 0
 
-    def _register_custom_rules(self):
-        """Register cyberpunk-specific rules."""
-
-        # Rule: Corporate surveillance increases when in corporate zones
-        def check_surveillance(world):
-            # Find player character (or any character in corporate zone)
-            for char in world.characters.values():
-                if char.location == "corporate_tower":
-                    return True
-            return False
-
-        def apply_surveillance(world):
-            self.surveillance_level = min(5, self.surveillance_level + 1)
-            logger.info(f"Corporate surveillance level increased to {self.surveillance_level}")
-
-        surveillance_rule = Rule(
-            name="corporate_surveillance",
-            description="Surveillance increases when in corporate zones",
-            priority=5,
-            condition=check_surveillance,
-            action=apply_surveillance
-        )
-        self.rules_engine.register_rule(surveillance_rule)
-
-        # Rule: Passive surveillance decay
-        def decay_surveillance(world):
-            if self.surveillance_level > 0:
-                self.surveillance_level = max(0, self.surveillance_level - 1)
-
-        decay_rule = RuleTemplates.create_periodic_rule(
-            name="surveillance_decay",
-            description="Surveillance slowly decreases over time",
-            interval=10,
-            action=decay_surveillance
-        )
-        self.rules_engine.register_rule(decay_rule)
+        # Item ids per item name, so access checks test keycards with one set operation
+        self._item_ids_by_name: Dict[str, Set[str]] = defaultdict(set)
 
-        # Rule: Netrunner hideout reduces surveillance
-        def check_hideout(world):
-            for char in world.characters.values():
-                if char.location == "netrunner_hideout":
-                    return True
-            return False
+    def create_item(self, data: Dict[str, Any]) -> Item:
+        """Create an item in the world and index it by name."""
+        item = super().create_item(data)
+        self._item_ids_by_name[item.name].add(item.id)
+        return item
 
-        def apply_hideout(world):
-            self.surveillance_level = max(0, self.surveillance_level - 2)
-            logger.info("Surveillance reduced by netrunner countermeasures")
+    def rebuild_indexes(self):
+        """Rebuild the lookup indexes, including the item ids per name."""
+        super().rebuild_indexes()
+        by_name = self._item_ids_by_name
+        by_name.clear()
+        for item in self.items.values():
+            by_name[item.name].add(item.id)
 
-        hideout_rule = Rule(
-            name="netrunner_countermeasures",
-            description="Netrunner hideout reduces surveillance",
-            priority=6,
-            condition=check_hideout,
-            action=apply_hideout
-        )
-        self.rules_engine.register_rule(hideout_rule)
+    def _register_custom_rules(self):
+        """Register cyberpunk-specific rules."""
+        # Scheduled rather than registered as a periodic rule, so it is not checked every
+        # tick; disable it with cancel_periodic("surveillance_decay"), not disable_rule
+        self.schedule_periodic(10, _decay_surveillance, name="surveillance_decay")
+        self.rules_engine.register_rules(_make_rules())
 
     def modify_faction_reputation(self, faction: str, amount: int):
         """
@@ -117,25 +168,17 @@ class CyberpunkCityWorld(BaseWorld):
             faction: Faction ID
             amount: Reputation change (-100 to 100)
         """
-        if faction in self.faction_reputation:
-            current = self.faction_reputation[faction]
-            self.faction_reputation[faction] = max(-100, min(100, current + amount))
-            logger.info(f"Faction {faction} reputation: {self.faction_reputation[faction]}")
+        reputations = self.faction_reputation
+        reputation = reputations.get(faction)
+        if reputation is not None:
+            reputation += amount
+            reputation = -100 if reputation < -100 else 100 if reputation > 100 else reputation
+            reputations[faction] = reputation
+            logger.info("Faction %s reputation: %s", faction, reputation)
 
     def get_faction_status(self, faction: str) -> str:
         """Get the relationship status with a faction."""
-        rep = self.faction_reputation.get(faction, 0)
-
-        if rep >= 80:
-            return "allied"
-        elif rep >= 40:
-            return "friendly"
-        elif rep >= -40:
-            return "neutral"
-        elif rep >= -80:
-            return "hostile"
-        else:
-            return "enemy"
+        return _FACTION_STATUS[bisect_right(_FACTION_THRESHOLDS, self.faction_reputation.get(faction, 0))]
 
     def can_access_location(self, character: Character, location_id: str) -> bool:
         """
@@ -153,18 +196,12 @@ class CyberpunkCityWorld(BaseWorld):
             return False
 
         # Check restricted locations
-        if location.properties.get("restricted", False):
-            # Corporate tower requires keycard or high stealth
-            if location_id == "corporate_tower":
-                has_keycard = any(
-                    self.items.get(item_id) and self.items[item_id].name == "Level 5 Keycard"
-                    for item_id in character.inventory
-                )
-                if not has_keycard:
-                    stealth = character.attributes.get("stealth", 0)
-                    if stealth < 20:
-                        logger.info(f"{character.name} denied access to Corporate Tower")
-                        return False
+        requirement = _ACCESS_CHECKS.get(location_id)
+        if requirement is not None and location.properties.get("restricted", False):
+            check, display_name = requirement
+            if not check(self, character):
+                logger.info("%s denied access to %s", character.name, display_name)
+                return False
 
         return True
 
@@ -177,12 +214,18 @@ class CyberpunkCityWorld(BaseWorld):
 
     def _process_random_encounters(self):
         """Process random encounters based on character locations."""
-        # Simple implementation - can be expanded
-        for char in self.characters.values():
-            if char.location == "slums":
-                # Higher chance of encounters in slums
-                if self.tick_count % 5 == 0:
-                    logger.debug(f"Random encounter check for {char.name} in Slums")
+        # Simple implementation - can be expanded; encounter checks are only logged so far
+        if self.tick_count % 5:
+            return
+        # Higher chance of encounters in slums
+        slum_ids = self.character_ids_at(SLUMS)
+        if not slum_ids or not logger.isEnabledFor(logging.DEBUG):
+            return
+        characters = self.characters
+        for character_id in slum_ids:
+            char = characters.get(character_id)
+            if char is not None:
+                logger.debug("Random encounter check for %s in Slums", char.name)
 
 
 def create_cyberpunk_city() -> CyberpunkCityWorld:
@@ -194,6 +237,14 @@ def create_cyberpunk_city() -> CyberpunkCityWorld:
 
 # Additional helper functions for the cyberpunk world
 
+# Fixed attributes of factory-made netrunners; copied into each character's own dict
+_NETRUNNER_ATTRIBUTES = MappingProxyType({
+    "stealth": 20,
+    "max_health": 60,
+    "max_energy": 150
+})
+
+
 def create_netrunner_character(name: str, hacking_skill: int = 50) -> Character:
     """Create a netrunner character with appropriate attributes."""
     return Character(
@@ -201,28 +252,24 @@ def create_netrunner_character(name: str, hacking_skill: int = 50) -> Character:
         description=f"A skilled netrunner with {hacking_skill} hacking ability",
         health=60,
         energy=150,
-        attributes={
-            "hacking": hacking_skill,
-            "stealth": 20,
-            "max_health": 60,
-            "max_energy": 150
-        }
+        attributes={"hacking": hacking_skill, **_NETRUNNER_ATTRIBUTES}
     )
 
 
 def create_corp_soldier_character(name: str, combat_level: int = 5) -> Character:
     """Create a corporate soldier character."""
+    max_health = 100 + combat_level * 20
     return Character(
         name=name,
-        description=f"A corporate security operative",
-        health=100 + (combat_level * 20),
+        description="A corporate security operative",
+        health=max_health,
         energy=100,
         level=combat_level,
         attributes={
-            "attack": 15 + (combat_level * 3),
-            "defense": 10 + (combat_level * 2),
+            "attack": 15 + combat_level * 3,
+            "defense": 10 + combat_level * 2,
             "loyalty": 80,
-            "max_health": 100 + (combat_level * 20)
+            "max_health": max_health
         }
     )
 